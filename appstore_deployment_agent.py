@@ -7,10 +7,18 @@ Interactive assistant that guides you through the entire deployment process.
 import os
 import sys
 import json
-import subprocess
+import time
+import argparse
+import statistics
+import tempfile
 from datetime import datetime
 from pathlib import Path
 
+from ios_preflight import run_preflight
+
+# asset_pipeline, build_scheduler, project_metadata (yaml) and toolchain are
+# imported by the stages that use them, so `--help`/`--report` stay fast
+
 # Colors for terminal output
 class Colors:
     HEADER = '\033[95m'
@@ -23,30 +31,193 @@ class Colors:
     BOLD = '\033[1m'
     UNDERLINE = '\033[4m'
 
+def new_state():
+    """Return an empty deployment state"""
+    return {
+        'current_stage': 0,
+        'completed_tasks': [],
+        'version': None,
+        'build_number': None,
+        'bundle_id': None,
+        'started_at': None
+    }
+
+
+def atomic_write_json(path, data):
+    """Write JSON to path atomically (temp file + fsync + rename)"""
+    path = Path(path)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+    # Persist the rename itself
+    try:
+        dir_fd = os.open(path.parent, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(dir_fd)
+    except OSError:
+        pass
+    finally:
+        os.close(dir_fd)
+
+
+class DeploymentJournal:
+    """Append-only log of deployment events (one JSON object per line)"""
+
+    STATE_FIELDS = ('version', 'build_number', 'bundle_id', 'started_at')
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.count = 0  # events in the journal, as of the last compact() and appends since
+
+    def append(self, event, **fields):
+        """Append an event and flush it to disk"""
+        entry = {'ts': datetime.now().isoformat(), 'event': event}
+        entry.update(fields)
+        with open(self.path, 'a') as f:
+            f.write(json.dumps(entry) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        self.count += 1
+        return entry
+
+    def events(self):
+        """Yield journal events, skipping a torn trailing line"""
+        if not self.path.exists():
+            return
+        with open(self.path, 'r') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+
+    def compact(self, state=None, start=0):
+        """Replay the journal into a deduplicated state view
+
+        With a snapshot, only the events after its first `start` are applied.
+        """
+        state = new_state() if state is None else state
+        self.count = 0
+        for entry in self.events():
+            self.count += 1
+            if self.count <= start:
+                continue
+            event = entry.get('event')
+            if event == 'run_reset':
+                state = new_state()
+                state['started_at'] = entry.get('started_at')
+            elif event == 'state_saved':
+                for field in self.STATE_FIELDS:
+                    if field in entry:
+                        state[field] = entry[field]
+            elif event == 'stage_completed':
+                name = entry.get('name')
+                if name and name not in state['completed_tasks']:
+                    state['completed_tasks'].append(name)
+                state['current_stage'] = max(state['current_stage'], entry.get('stage', 0) + 1)
+        return state
+
+    def history(self, event=None):
+        """Return all journal events, optionally filtered by type"""
+        return [e for e in self.events() if event is None or e.get('event') == event]
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+def summarize_durations(events, key):
+    """Group event durations by key -> (count, median, p95, total)"""
+    grouped = {}
+    for entry in events:
+        if 'duration' in entry and entry.get(key):
+            grouped.setdefault(entry[key], []).append(entry['duration'])
+
+    return {
+        name: (len(values), statistics.median(values), percentile(values, 95), sum(values))
+        for name, values in grouped.items()
+    }
+
+
+def format_seconds(seconds):
+    """Format a duration for the report table"""
+    if seconds >= 60:
+        return f"{seconds / 60:.1f}m"
+    return f"{seconds:.1f}s"
+
+
 class DeploymentAgent:
-    def __init__(self):
+    def __init__(self, backend=None, assume_yes=False, state_dir=None):
+        from toolchain import ShellBackend
+
         self.project_root = Path.cwd()
-        self.state_file = self.project_root / '.deployment_state.json'
+        self.backend = backend or ShellBackend()
+        self.assume_yes = assume_yes
+        self.prompt_wait = 0.0  # seconds spent waiting for answers, excluded from stage durations
+        # Where state, journal, build logs and the asset cache go (a scratch dir for dry runs)
+        self.state_dir = Path(state_dir) if state_dir else self.project_root
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        self.state_file = self.state_dir / '.deployment_state.json'
+        self.journal = DeploymentJournal(self.state_dir / '.deployment_journal.jsonl')
         self.state = self.load_state()
 
     def load_state(self):
-        """Load deployment progress state"""
-        if self.state_file.exists():
+        """Load deployment progress: the snapshot plus journal events written after it"""
+        try:
             with open(self.state_file, 'r') as f:
-                return json.load(f)
-        return {
-            'current_stage': 0,
-            'completed_tasks': [],
-            'version': None,
-            'build_number': None,
-            'bundle_id': None,
-            'started_at': None
-        }
+                state = json.load(f)
+        except (json.JSONDecodeError, OSError):
+            state = None  # Missing or unreadable; rebuild it from the whole journal
+
+        start = 0
+        if state is not None:
+            # Older snapshots accumulated a duplicate entry per re-run
+            state['completed_tasks'] = list(dict.fromkeys(state.get('completed_tasks', [])))
+            # A crash between a journal append and the snapshot write leaves the
+            # snapshot behind the journal; only the events it missed are replayed
+            start = state.pop('journal_events', 0)
+        state = self.journal.compact(state, start)
+
+        if self.journal.count != start:
+            self.write_snapshot(state)
+        return state
+
+    def write_snapshot(self, state=None):
+        """Write the state snapshot, recording how much of the journal it covers"""
+        state = self.state if state is None else state
+        atomic_write_json(self.state_file, dict(state, journal_events=self.journal.count))
 
     def save_state(self):
         """Save deployment progress state"""
-        with open(self.state_file, 'w') as f:
-            json.dump(self.state, f, indent=2)
+        self.journal.append(
+            'state_saved',
+            **{field: self.state.get(field) for field in DeploymentJournal.STATE_FIELDS}
+        )
+        self.write_snapshot()
+
+    def reset_state(self):
+        """Start a fresh deployment run"""
+        self.state = new_state()
+        self.state['started_at'] = datetime.now().isoformat()
+        self.journal.append('run_reset', started_at=self.state['started_at'])
+        self.write_snapshot()
 
     def print_header(self, text):
         """Print section header"""
@@ -70,10 +241,13 @@ class DeploymentAgent:
         """Print info message"""
         print(f"{Colors.BLUE}ℹ️  {text}{Colors.END}")
 
-    def ask_yes_no(self, question):
-        """Ask yes/no question"""
+    def ask_yes_no(self, question, default=True):
+        """Ask yes/no question; with --yes the answer is default (False for risky steps)"""
+        if self.assume_yes:
+            print(f"{Colors.CYAN}❓ {question} (y/n): {Colors.END}{'y' if default else 'n'}")
+            return default
         while True:
-            response = input(f"{Colors.CYAN}❓ {question} (y/n): {Colors.END}").lower()
+            response = self._input(f"{Colors.CYAN}❓ {question} (y/n): {Colors.END}").lower()
             if response in ['y', 'yes']:
                 return True
             elif response in ['n', 'no']:
@@ -88,30 +262,36 @@ class DeploymentAgent:
         else:
             prompt = f"{Colors.CYAN}❓ {question}: {Colors.END}"
 
-        response = input(prompt).strip()
+        if self.assume_yes:
+            print(f"{prompt}{default or ''}")
+            return default
+
+        response = self._input(prompt).strip()
         return response if response else default
 
-    def run_command(self, command, capture=True):
-        """Run shell command"""
+    def _input(self, prompt):
+        """Read an answer, accounting the wait to prompt_wait"""
+        start = time.monotonic()
         try:
-            if capture:
-                result = subprocess.run(
-                    command,
-                    shell=True,
-                    capture_output=True,
-                    text=True,
-                    cwd=self.project_root
-                )
-                return result.returncode == 0, result.stdout, result.stderr
-            else:
-                result = subprocess.run(
-                    command,
-                    shell=True,
-                    cwd=self.project_root
-                )
-                return result.returncode == 0, "", ""
-        except Exception as e:
-            return False, "", str(e)
+            return input(prompt)
+        finally:
+            self.prompt_wait += time.monotonic() - start
+
+    def run_command(self, command, capture=True, log_path=None):
+        """Run shell command"""
+        start = time.monotonic()
+        success, stdout, stderr = self._run_command(command, capture, log_path)
+        self.journal.append(
+            'command_finished',
+            command=command,
+            duration=round(time.monotonic() - start, 3),
+            success=success
+        )
+        return success, stdout, stderr
+
+    def _run_command(self, command, capture, log_path=None):
+        """Run shell command without timing"""
+        return self.backend.run(command, self.project_root, capture, log_path)
 
     def check_file_exists(self, path):
         """Check if file exists"""
@@ -128,15 +308,11 @@ class DeploymentAgent:
 
     def get_version_from_pubspec(self):
         """Extract version from pubspec.yaml"""
-        content = self.read_file('pubspec.yaml')
-        if content:
-            for line in content.split('\n'):
-                if line.startswith('version:'):
-                    version_str = line.split('version:')[1].strip()
-                    parts = version_str.split('+')
-                    if len(parts) == 2:
-                        return parts[0], parts[1]
-        return None, None
+        if not self.check_file_exists('pubspec.yaml'):
+            return None, None
+        from project_metadata import Pubspec
+        pubspec = Pubspec.load(self.project_root)
+        return pubspec.version, pubspec.build_number
 
     def stage_1_welcome(self):
         """Stage 1: Welcome and prerequisites"""
@@ -148,18 +324,9 @@ class DeploymentAgent:
         if self.state['started_at']:
             print(f"You started this deployment on: {self.state['started_at']}")
             if not self.ask_yes_no("Do you want to continue from where you left off?"):
-                self.state = {
-                    'current_stage': 0,
-                    'completed_tasks': [],
-                    'version': None,
-                    'build_number': None,
-                    'bundle_id': None,
-                    'started_at': datetime.now().isoformat()
-                }
-                self.save_state()
+                self.reset_state()
         else:
-            self.state['started_at'] = datetime.now().isoformat()
-            self.save_state()
+            self.reset_state()
 
         print("\n📋 Prerequisites Check:")
         print("="  * 60)
@@ -207,25 +374,25 @@ class DeploymentAgent:
 
         print("Let's check your app assets and configuration.\n")
 
+        # Static pre-flight: icon dimensions and Info.plist keys
+        preflight_issues = run_preflight(self.project_root)
+        icon_issues = [i for i in preflight_issues if i.check == 'icons']
+        plist_issues = [i for i in preflight_issues if i.check == 'plist']
+
         # Check App Icon
         print("1️⃣  App Icon Check:")
-        icon_path = "ios/Runner/Assets.xcassets/AppIcon.appiconset"
-        if self.check_file_exists(icon_path):
-            # Count PNG files
-            icon_dir = self.project_root / icon_path
-            png_count = len(list(icon_dir.glob("*.png")))
-
-            if png_count >= 10:
-                self.print_success(f"App Icon found ({png_count} images)")
-            else:
-                self.print_warning(f"Only {png_count} icon images found (need ~15)")
-                self.print_info("Generate all sizes at: https://appicon.co/")
-                if not self.ask_yes_no("Continue anyway?"):
-                    return False
+        if icon_issues:
+            for issue in icon_issues:
+                if issue.severity == 'ERROR':
+                    self.print_error(issue.message)
+                else:
+                    self.print_warning(issue.message)
+            self.print_info("Generate all sizes at: https://appicon.co/")
+            # A dry run ships nothing, so --yes carries on and still exercises the build stages
+            if not self.ask_yes_no("Continue anyway?", default=self.backend.dry_run):
+                return False
         else:
-            self.print_error("AppIcon.appiconset not found")
-            self.print_info("Create app icons at: https://appicon.co/")
-            return False
+            self.print_success("App Icon set complete (all sizes verified)")
 
         # Check Screenshots
         print("\n2️⃣  Screenshots:")
@@ -252,10 +419,25 @@ class DeploymentAgent:
 
             if not self.ask_yes_no(f"Is version {version}+{build} correct for this release?"):
                 new_version = self.ask_input("Enter new version (e.g., 1.0.0)", version)
-                new_build = self.ask_input("Enter new build number (e.g., 1)", build)
+                next_build = str(int(build) + 1) if build.isdigit() else build
+                new_build = self.ask_input("Enter new build number (e.g., 1)", next_build)
+
+                from project_metadata import Pubspec
+                pubspec = Pubspec.load(self.project_root)
+                try:
+                    pubspec.set_version(new_version, new_build)
+                except ValueError as e:
+                    self.print_error(str(e))
+                    return False
+                if self.backend.dry_run:
+                    self.print_info("Dry run: pubspec.yaml left unchanged")
+                else:
+                    pubspec.save()
 
-                self.print_info(f"Please update pubspec.yaml to: version: {new_version}+{new_build}")
-                input("Press Enter after updating pubspec.yaml...")
+                self.state['version'] = new_version
+                self.state['build_number'] = new_build
+                self.save_state()
+                self.print_success(f"pubspec.yaml updated to: version: {new_version}+{new_build}")
         else:
             self.print_error("Could not read version from pubspec.yaml")
             return False
@@ -273,29 +455,15 @@ class DeploymentAgent:
         print("\n5️⃣  Info.plist Privacy Descriptions:")
         info_plist_path = "ios/Runner/Info.plist"
 
-        if self.check_file_exists(info_plist_path):
-            content = self.read_file(info_plist_path)
-
-            required_keys = [
-                ("NSMicrophoneUsageDescription", "Microphone"),
-                ("NSUserNotificationsUsageDescription", "Notifications"),
-            ]
-
-            all_found = True
-            for key, name in required_keys:
-                if key in content:
-                    self.print_success(f"{name} description found")
-                else:
-                    self.print_error(f"{name} description missing: {key}")
-                    all_found = False
-
-            if not all_found:
-                self.print_warning("Add missing descriptions to ios/Runner/Info.plist")
-                if not self.ask_yes_no("Continue anyway?"):
-                    return False
+        if plist_issues:
+            for issue in plist_issues:
+                self.print_error(issue.message)
+            self.print_warning(f"Fix {info_plist_path} before archiving")
+            # A dry run ships nothing, so --yes carries on and still exercises the build stages
+            if not self.ask_yes_no("Continue anyway?", default=self.backend.dry_run):
+                return False
         else:
-            self.print_error("Info.plist not found")
-            return False
+            self.print_success("All required keys and usage descriptions found")
 
         # Check Privacy Policy
         print("\n6️⃣  Privacy Policy:")
@@ -310,6 +478,28 @@ class DeploymentAgent:
         else:
             self.print_success(f"Privacy Policy: {privacy_url}")
 
+        # Check asset weight
+        print("\n7️⃣  Asset Weight:")
+        # Off under --yes: a full analysis re-deflates every PNG (over a minute on one CPU)
+        if self.ask_yes_no("Analyze bundled image assets for size savings?", default=False):
+            from asset_pipeline import AssetPipeline, format_bytes
+            cache_dir = self.state_dir / '.asset_cache' if self.backend.dry_run else None
+            pipeline = AssetPipeline(self.project_root, cache_dir=cache_dir)
+            reports = pipeline.analyze()
+            total = sum(r.size for r in reports)
+            savings = sum(r.estimated_savings for r in reports)
+            self.print_info(
+                f"{len(reports)} images, {format_bytes(total)} total, "
+                f"~{format_bytes(savings)} can be saved"
+            )
+
+            if savings and self.backend.dry_run:
+                self.print_info("Dry run: assets left unchanged")
+            elif savings and self.ask_yes_no("Recompress and downscale assets now?", default=False):
+                saved = pipeline.optimize(reports)
+                self.print_success(f"Assets optimized, saved {format_bytes(saved)}")
+            self.print_info("Full per-file report: python3 asset_pipeline.py")
+
         print("\n✅ Assets and configuration check complete!")
         return True
 
@@ -325,32 +515,43 @@ class DeploymentAgent:
             if success:
                 self.print_success("Clean complete")
 
-            self.print_info("Running flutter pub get...")
-            success, _, _ = self.run_command("flutter pub get", capture=False)
-            if success:
-                self.print_success("Dependencies updated")
-
-            self.print_info("Updating iOS CocoaPods...")
-            success, _, _ = self.run_command("cd ios && pod install", capture=False)
-            if success:
-                self.print_success("CocoaPods updated")
-
-            self.print_info("Building iOS release (this may take 5-10 minutes)...")
-            success, _, stderr = self.run_command(
-                "flutter build ios --release --no-codesign",
-                capture=False
+            targets = ['ios']
+            if self.ask_yes_no("Also build Android (appbundle) and web in parallel?"):
+                targets += ['appbundle', 'web']
+
+            self.print_info(f"Building {', '.join(targets)} release (this may take 5-10 minutes)...")
+            from build_scheduler import BuildScheduler, default_tasks
+            scheduler = BuildScheduler(
+                self.project_root,
+                default_tasks(targets),
+                runner=lambda command, log_path: self.run_command(command, log_path=log_path)[0],
+                on_finish=self.report_build_task,
+                host_platform=self.backend.platform,
+                log_dir=self.state_dir / 'build' / 'logs'
             )
+            scheduler.run()
+            scheduler.print_table()
 
-            if success:
-                self.print_success("iOS release build complete!")
-            else:
-                self.print_error("Build failed")
-                print(f"Error: {stderr}")
+            # The App Store path needs the iOS build; other platforms only warn
+            if scheduler.tasks['ios'].status != 'ok':
+                self.print_error(f"iOS build {scheduler.tasks['ios'].status}: {scheduler.tasks['ios'].reason}")
                 return False
+            for task in scheduler.tasks.values():
+                if task.status in ('failed', 'blocked'):
+                    self.print_warning(f"{task.name} {task.status}: {task.reason}")
 
         print("\n✅ Build preparation complete!")
         return True
 
+    def report_build_task(self, task):
+        """Journal and print one finished build task"""
+        self.journal.append('build_task_finished', name=task.name, status=task.status,
+                            duration=round(task.duration, 3))
+        if task.status == 'ok':
+            self.print_success(f"{task.name} complete ({format_seconds(task.duration)})")
+        else:
+            self.print_error(f"{task.name} failed ({format_seconds(task.duration)}), log: {task.log_path}")
+
     def stage_4_xcode_configuration(self):
         """Stage 4: Xcode configuration"""
         self.print_header("⚙️  Stage 4: Xcode Configuration")
@@ -618,6 +819,8 @@ class DeploymentAgent:
             if self.ask_yes_no("Clear deployment progress tracking?"):
                 if self.state_file.exists():
                     self.state_file.unlink()
+                # The journal keeps the history; the reset marks a clean slate
+                self.journal.append('run_reset', started_at=None)
                 self.print_success("Deployment state cleared")
 
             return True
@@ -625,6 +828,48 @@ class DeploymentAgent:
             self.print_info("Complete submission when ready")
             return False
 
+    def print_report(self):
+        """Print historical stage and command durations from the journal"""
+        self.print_header("⏱️  Deployment Timing Report")
+
+        events = list(self.journal.events())
+        if not events:
+            self.print_info("No deployment history recorded yet")
+            return
+
+        # Stage 8's "clear progress" also appends run_reset, without a start time
+        runs = sum(1 for e in events if e.get('event') == 'run_reset' and e.get('started_at'))
+        print(f"Runs recorded: {max(runs, 1)}")
+        waited = sum(e.get('prompt_wait', 0) for e in events if e.get('event') in ('stage_completed', 'stage_failed'))
+        if waited:
+            print(f"Waiting for answers: {format_seconds(waited)} (not included in stage times)")
+        print()
+
+        sections = [
+            ("Stages", [e for e in events if e.get('event') in ('stage_completed', 'stage_failed')], 'name'),
+            ("Builds", [e for e in events if e.get('event') == 'build_task_finished'], 'name'),
+            ("Commands", [e for e in events if e.get('event') == 'command_finished'], 'command'),
+        ]
+
+        for title, section_events, key in sections:
+            summary = summarize_durations(section_events, key)
+            if not summary:
+                continue
+
+            width = max(len(name) for name in summary)
+            print(f"{Colors.BOLD}{title}:{Colors.END}")
+            print(f"   {'Name'.ljust(width)}  {'Runs':>5}  {'Median':>8}  {'p95':>8}  {'Total':>8}")
+            for name, (count, median, p95, total) in sorted(summary.items(), key=lambda item: -item[1][3]):
+                print(
+                    f"   {name.ljust(width)}  {count:>5}  {format_seconds(median):>8}  "
+                    f"{format_seconds(p95):>8}  {format_seconds(total):>8}"
+                )
+            print()
+
+        failed = [e for e in events if e.get('event') == 'command_finished' and not e.get('success')]
+        if failed:
+            self.print_warning(f"{len(failed)} command invocations failed")
+
     def run(self):
         """Run the deployment agent"""
         stages = [
@@ -644,11 +889,21 @@ class DeploymentAgent:
             if idx < current_stage:
                 continue
 
+            self.journal.append('stage_started', stage=idx, name=stage_name)
+            stage_start = time.monotonic()
+            self.prompt_wait = 0.0
+
             success = stage_func()
+            # Time the stage spent working, not waiting for the user
+            prompt_wait = round(self.prompt_wait, 3)
+            duration = round(time.monotonic() - stage_start - prompt_wait, 3)
 
             if success:
+                self.journal.append('stage_completed', stage=idx, name=stage_name, duration=duration,
+                                    prompt_wait=prompt_wait)
                 self.state['current_stage'] = idx + 1
-                self.state['completed_tasks'].append(stage_name)
+                if stage_name not in self.state['completed_tasks']:
+                    self.state['completed_tasks'].append(stage_name)
                 self.save_state()
 
                 if idx < len(stages) - 1:
@@ -656,6 +911,8 @@ class DeploymentAgent:
                         self.print_info("Progress saved. Run this script again to continue.")
                         sys.exit(0)
             else:
+                self.journal.append('stage_failed', stage=idx, name=stage_name, duration=duration,
+                                    prompt_wait=prompt_wait)
                 self.print_error(f"Stage {idx + 1} incomplete. Please address issues and try again.")
                 self.save_state()
                 sys.exit(1)
@@ -666,9 +923,51 @@ class DeploymentAgent:
         print("Check your email and App Store Connect for updates.\n")
         print("Good luck! 🚀\n")
 
-if __name__ == "__main__":
+def parse_args():
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="Apple App Store Deployment AI Agent")
+    parser.add_argument(
+        '--report',
+        action='store_true',
+        help="Summarize stage and command durations across recorded runs"
+    )
+    parser.add_argument(
+        '--fake-toolchain',
+        nargs='?',
+        const='',
+        metavar='CONFIG',
+        help="Simulate flutter/pod/xcodebuild/open (optional JSON config, see toolchain.py)"
+    )
+    parser.add_argument(
+        '--yes',
+        action='store_true',
+        help="Answer every question with its default (non-interactive runs); "
+             "risky steps such as continuing past errors or rewriting assets are declined"
+    )
+    parser.add_argument(
+        '--state-dir',
+        type=Path,
+        metavar='DIR',
+        help="Where state, journal and build logs go (default: project; a temp dir with --fake-toolchain)"
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
     try:
-        agent = DeploymentAgent()
+        backend = None
+        state_dir = args.state_dir
+        if args.fake_toolchain is not None:
+            from toolchain import FakeToolchainBackend
+            backend = FakeToolchainBackend.from_file(args.fake_toolchain) if args.fake_toolchain else FakeToolchainBackend()
+            # A simulated run must not touch the checkout
+            state_dir = state_dir or Path(tempfile.mkdtemp(prefix='odyseya-fake-deploy-'))
+            print(f"{Colors.BLUE}ℹ️  Fake toolchain: dry run, state and logs in {state_dir}{Colors.END}")
+        agent = DeploymentAgent(backend, args.yes, state_dir)
+        if args.report:
+            agent.print_report()
+            sys.exit(0)
         agent.run()
     except KeyboardInterrupt:
         print(f"\n\n{Colors.YELLOW}Deployment paused. Run this script again to continue.{Colors.END}\n")
@@ -676,3 +975,7 @@ if __name__ == "__main__":
     except Exception as e:
         print(f"\n{Colors.RED}Error: {e}{Colors.END}\n")
         sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,458 @@
+#!/usr/bin/env python3
+"""
+Odyseya Asset Pipeline
+Reports the weight of bundled images and optionally shrinks them:
+lossless PNG recompression (metadata stripped, IDAT re-deflated) and
+downscaling of oversized images when Pillow is installed.
+
+Results are cached under .asset_cache/ keyed by file content hash, so
+repeated runs only process new or changed files. Optimized outputs kept
+there are evicted least recently used first once the cache passes
+--cache-size.
+
+Usage: python3 asset_pipeline.py [--optimize] [--max-dimension N] [--workers N] [--cache-size MB]
+"""
+
+import os
+import json
+import zlib
+import struct
+import hashlib
+import argparse
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+
+from ios_preflight import PNG_SIGNATURE, parse_png_header
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow is only needed for downscaling
+    Image = None
+
+
+ASSET_ROOTS = ['assets', 'ios/Runner/Assets.xcassets']
+IMAGE_SUFFIXES = {'.png', '.jpg', '.jpeg'}
+
+CACHE_DIR = '.asset_cache'
+CACHE_MANIFEST = 'manifest.json'
+
+# Bump when the transform changes so stale cache entries are ignored
+PIPELINE_VERSION = 3
+
+# Optimized blobs kept in .asset_cache/ (the manifest itself is not counted)
+DEFAULT_CACHE_BYTES = 16 * 1024 * 1024
+
+DEFAULT_MAX_DIMENSION = 1536
+
+# Per-folder limits for images that never render large (mood icons are < 200pt)
+MAX_DIMENSION_OVERRIDES = {
+    'assets/images/moods': 512,
+}
+
+# App Store Connect checks icon pixel sizes exactly: recompress these losslessly, never resize
+FIXED_SIZE_FOLDERS = ('.appiconset',)
+
+# JPEG start-of-frame markers (baseline, progressive, lossless, ...) carry the dimensions
+JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+# Ancillary chunks that affect how pixels render; everything else is metadata
+PRESERVED_CHUNKS = {b'IHDR', b'PLTE', b'tRNS', b'iCCP', b'sRGB', b'gAMA', b'cHRM', b'sBIT', b'IEND'}
+
+
+class AssetReport:
+    """Weight and savings estimate for one image"""
+
+    def __init__(self, path: str, content_hash: str, size: int, width: int = None, height: int = None,
+                 lossless_size: int = None, max_dimension: int = None):
+        self.path = path
+        self.content_hash = content_hash
+        self.size = size
+        self.width = width
+        self.height = height
+        self.lossless_size = lossless_size
+        self.max_dimension = max_dimension
+
+    @property
+    def oversized(self) -> bool:
+        return bool(self.width and self.max_dimension and max(self.width, self.height) > self.max_dimension)
+
+    @property
+    def estimated_size(self) -> int:
+        """Estimated size after lossless recompression and downscaling (when Pillow can do it)"""
+        estimate = self.lossless_size or self.size
+        if self.oversized and Image is not None:
+            ratio = self.max_dimension / max(self.width, self.height)
+            estimate = int(estimate * ratio * ratio)
+        return estimate
+
+    @property
+    def estimated_savings(self) -> int:
+        return max(0, self.size - self.estimated_size)
+
+    def to_dict(self) -> Dict:
+        return {
+            'size': self.size,
+            'width': self.width,
+            'height': self.height,
+            'lossless_size': self.lossless_size,
+        }
+
+
+def parse_jpeg_size(data: bytes) -> Optional[Tuple[int, int]]:
+    """(width, height) from the first start-of-frame segment of a JPEG"""
+    if not data.startswith(b'\xff\xd8'):
+        return None
+    offset = 2
+    while offset + 4 <= len(data):
+        if data[offset] != 0xFF:
+            return None
+        marker = data[offset + 1]
+        if marker == 0xFF:  # fill byte
+            offset += 1
+            continue
+        if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7:  # no payload
+            offset += 2
+            continue
+        length, = struct.unpack('>H', data[offset + 2:offset + 4])
+        if marker in JPEG_SOF_MARKERS:
+            if offset + 9 > len(data):
+                return None
+            height, width = struct.unpack('>HH', data[offset + 5:offset + 9])
+            return width, height
+        if marker == 0xDA:  # start of scan: no frame header before the image data
+            return None
+        offset += 2 + length
+    return None
+
+
+def iter_chunks(data: bytes):
+    """Yield (type, payload) for each PNG chunk"""
+    offset = len(PNG_SIGNATURE)
+    while offset + 8 <= len(data):
+        length, = struct.unpack('>I', data[offset:offset + 4])
+        chunk_type = data[offset + 4:offset + 8]
+        yield chunk_type, data[offset + 8:offset + 8 + length]
+        offset += 12 + length
+        if chunk_type == b'IEND':
+            break
+
+
+def make_chunk(chunk_type: bytes, payload: bytes) -> bytes:
+    crc = zlib.crc32(chunk_type + payload) & 0xFFFFFFFF
+    return struct.pack('>I', len(payload)) + chunk_type + payload + struct.pack('>I', crc)
+
+
+def recompress_png(data: bytes) -> Optional[bytes]:
+    """Losslessly re-encode a PNG: drop metadata chunks, re-deflate IDAT at maximum level"""
+    if not data.startswith(PNG_SIGNATURE):
+        return None
+
+    kept = []
+    idat = []
+    for chunk_type, payload in iter_chunks(data):
+        if chunk_type == b'IDAT':
+            idat.append(payload)
+        elif chunk_type in PRESERVED_CHUNKS:
+            kept.append((chunk_type, payload))
+
+    try:
+        raw = zlib.decompress(b''.join(idat))
+    except zlib.error:
+        return None
+
+    compressor = zlib.compressobj(9, zlib.DEFLATED, zlib.MAX_WBITS, 9)
+    best = compressor.compress(raw) + compressor.flush()
+
+    out = [PNG_SIGNATURE]
+    for chunk_type, payload in kept:
+        if chunk_type == b'IEND':
+            out.append(make_chunk(b'IDAT', best))
+        out.append(make_chunk(chunk_type, payload))
+    return b''.join(out)
+
+
+def downscale_image(path: Path, data: bytes, max_dimension: int) -> Optional[bytes]:
+    """Resize so the longest side is max_dimension (requires Pillow)"""
+    if Image is None:
+        return None
+
+    from io import BytesIO
+    with Image.open(BytesIO(data)) as image:
+        image.thumbnail((max_dimension, max_dimension), Image.LANCZOS)
+        buffer = BytesIO()
+        if path.suffix.lower() == '.png':
+            image.save(buffer, format='PNG', optimize=True)
+        else:
+            image.save(buffer, format='JPEG', quality=90, optimize=True)
+        return buffer.getvalue()
+
+
+class AssetPipeline:
+    """Scans, reports and optimizes image assets"""
+
+    def __init__(self, project_root, max_dimension: int = DEFAULT_MAX_DIMENSION, workers: int = None,
+                 cache_bytes: int = DEFAULT_CACHE_BYTES, cache_dir=None):
+        self.project_root = Path(project_root)
+        self.max_dimension = max_dimension
+        self.cache_bytes = cache_bytes
+        self.workers = workers or min(32, (os.cpu_count() or 1) + 4)
+        self.cache_dir = Path(cache_dir) if cache_dir else self.project_root / CACHE_DIR
+        self.manifest = self.load_manifest()
+
+    def load_manifest(self) -> Dict:
+        """Load cached analysis results keyed by content hash"""
+        manifest_path = self.cache_dir / CACHE_MANIFEST
+        if manifest_path.exists():
+            try:
+                with open(manifest_path, 'r') as f:
+                    manifest = json.load(f)
+                if manifest.get('version') == PIPELINE_VERSION:
+                    return manifest
+            except (OSError, json.JSONDecodeError):
+                pass
+        return {'version': PIPELINE_VERSION, 'entries': {}}
+
+    def save_manifest(self):
+        """Save cached analysis results"""
+        self.evict_blobs()
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        manifest_path = self.cache_dir / CACHE_MANIFEST
+        tmp_path = manifest_path.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(self.manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, manifest_path)
+
+    def find_assets(self) -> List[Path]:
+        """Find all images under the asset roots"""
+        files = []
+        for root in ASSET_ROOTS:
+            root_path = self.project_root / root
+            if not root_path.exists():
+                continue
+            for file_path in root_path.rglob('*'):
+                if file_path.suffix.lower() in IMAGE_SUFFIXES and file_path.is_file():
+                    files.append(file_path)
+        return sorted(files)
+
+    def max_dimension_for(self, rel_path: str) -> Optional[int]:
+        """Downscale limit for one asset; None when it must keep its pixel size"""
+        if any(folder.endswith(FIXED_SIZE_FOLDERS) for folder in rel_path.split('/')[:-1]):
+            return None
+        for prefix, limit in MAX_DIMENSION_OVERRIDES.items():
+            if rel_path.startswith(prefix + '/'):
+                return min(limit, self.max_dimension)
+        return self.max_dimension
+
+    def analyze_file(self, file_path: Path) -> AssetReport:
+        """Analyze one image, reusing cached results for known content"""
+        data = file_path.read_bytes()
+        content_hash = hashlib.sha256(data).hexdigest()
+        rel_path = file_path.relative_to(self.project_root).as_posix()
+        max_dimension = self.max_dimension_for(rel_path)
+
+        cached = self.manifest['entries'].get(content_hash)
+        if cached:
+            return AssetReport(rel_path, content_hash, cached['size'], cached['width'], cached['height'],
+                               cached['lossless_size'], max_dimension)
+
+        header = parse_png_header(data[:26])
+        width = height = lossless_size = None
+        optimized_hash = None
+        jpeg_size = None if header else parse_jpeg_size(data)
+        if jpeg_size:
+            width, height = jpeg_size
+            lossless_size = len(data)  # JPEGs are only ever downscaled
+        elif header:
+            width, height, _ = header
+            recompressed = recompress_png(data)
+            if recompressed and len(recompressed) < len(data):
+                # Keep the result so --optimize does not recompress again
+                lossless_size = len(recompressed)
+                optimized_hash = self.store_blob(recompressed, file_path.suffix)
+            else:
+                lossless_size = len(data)
+
+        report = AssetReport(rel_path, content_hash, len(data), width, height, lossless_size, max_dimension)
+        entry = report.to_dict()
+        entry['lossless'] = optimized_hash
+        self.manifest['entries'][content_hash] = entry
+        return report
+
+    def store_blob(self, data: bytes, suffix: str) -> str:
+        """Store optimized output in the cache; returns its content hash"""
+        blob_hash = hashlib.sha256(data).hexdigest()
+        blob_path = self.cache_dir / f"{blob_hash}{suffix.lower()}"
+        if blob_path.exists():
+            os.utime(blob_path)  # recently used
+        else:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            # Unique temp name: identical assets store the same blob from several threads
+            fd, tmp_name = tempfile.mkstemp(dir=self.cache_dir, prefix=f".{blob_path.name}.", suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.chmod(tmp_name, 0o644)
+            os.replace(tmp_name, blob_path)
+
+        # Optimized output is a fixed point of the pipeline
+        width, height, _ = parse_png_header(data[:26]) or (None, None, None)
+        self.manifest['entries'].setdefault(blob_hash, {
+            'size': len(data),
+            'width': width,
+            'height': height,
+            'lossless_size': len(data),
+            'lossless': None,
+        })
+        return blob_hash
+
+    def load_blob(self, blob_hash: Optional[str], suffix: str) -> Optional[bytes]:
+        if not blob_hash:
+            return None
+        blob_path = self.cache_dir / f"{blob_hash}{suffix.lower()}"
+        try:
+            data = blob_path.read_bytes()
+        except OSError:
+            return None  # evicted
+        os.utime(blob_path)
+        return data
+
+    def evict_blobs(self):
+        """Delete least recently used blobs until the cache fits cache_bytes"""
+        if not self.cache_dir.is_dir():
+            return
+        blobs = []
+        for path in self.cache_dir.iterdir():
+            if path.name == CACHE_MANIFEST or path.name.startswith('.'):
+                continue
+            stat = path.stat()
+            blobs.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in blobs)
+        evicted = set()
+        for _, size, path in sorted(blobs):
+            if total <= self.cache_bytes:
+                break
+            path.unlink()
+            total -= size
+            evicted.add(path.stem)
+
+        if evicted:
+            for entry in self.manifest['entries'].values():
+                if entry.get('lossless') in evicted:
+                    entry['lossless'] = None
+                downscaled = entry.get('downscaled') or {}
+                for max_dimension in [d for d, blob_hash in downscaled.items() if blob_hash in evicted]:
+                    del downscaled[max_dimension]
+
+    def analyze(self) -> List[AssetReport]:
+        """Analyze all assets in parallel (zlib and hashing release the GIL)"""
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            reports = list(pool.map(self.analyze_file, self.find_assets()))
+        self.save_manifest()
+        return reports
+
+    def optimize_file(self, report: AssetReport) -> int:
+        """Rewrite one asset from the cache (or compute it); returns bytes saved"""
+        file_path = self.project_root / report.path
+        suffix = file_path.suffix
+        entry = self.manifest['entries'][report.content_hash]
+        downscale = report.oversized and Image is not None
+        # Identical files can have different limits (per-folder overrides, --max-dimension)
+        downscaled = entry.setdefault('downscaled', {})
+
+        if downscale:
+            optimized = self.load_blob(downscaled.get(str(report.max_dimension)), suffix)
+        else:
+            optimized = self.load_blob(entry.get('lossless'), suffix)
+        if optimized is None and not downscale and suffix.lower() == '.png':
+            optimized = recompress_png(file_path.read_bytes())  # blob was evicted
+        if optimized is None and downscale:
+            optimized = downscale_image(file_path, file_path.read_bytes(), report.max_dimension)
+            if optimized and suffix.lower() == '.png':
+                recompressed = recompress_png(optimized)
+                if recompressed and len(recompressed) < len(optimized):
+                    optimized = recompressed
+            if optimized:
+                downscaled[str(report.max_dimension)] = self.store_blob(optimized, suffix)
+
+        if optimized is None or len(optimized) >= report.size:
+            return 0
+
+        tmp_path = file_path.with_name(f".{file_path.name}.tmp")
+        tmp_path.write_bytes(optimized)
+        os.replace(tmp_path, file_path)
+        return report.size - len(optimized)
+
+    def optimize(self, reports: List[AssetReport]) -> int:
+        """Optimize every asset with estimated savings; returns total bytes saved"""
+        candidates = [r for r in reports if r.estimated_savings > 0]
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            saved = sum(pool.map(self.optimize_file, candidates))
+        self.save_manifest()
+        return saved
+
+
+def format_bytes(size: int) -> str:
+    if size >= 1024 * 1024:
+        return f"{size / (1024 * 1024):.1f} MB"
+    return f"{size / 1024:.0f} KB"
+
+
+def print_report(reports: List[AssetReport]):
+    """Print per-file weight, dimensions and estimated savings"""
+    print("🖼️  Odyseya Asset Report")
+    print("=" * 60)
+
+    width = max((len(r.path) for r in reports), default=10)
+    for r in sorted(reports, key=lambda r: -r.size):
+        dims = f"{r.width}x{r.height}" if r.width else "-"
+        flag = " ⚠️  oversized" if r.oversized else ""
+        print(f"{r.path.ljust(width)}  {format_bytes(r.size):>8}  {dims:>10}  "
+              f"-{format_bytes(r.estimated_savings):>8}{flag}")
+
+    duplicates = {}
+    for r in reports:
+        duplicates.setdefault(r.content_hash, []).append(r.path)
+    duplicates = [paths for paths in duplicates.values() if len(paths) > 1]
+
+    total = sum(r.size for r in reports)
+    savings = sum(r.estimated_savings for r in reports)
+    print("=" * 60)
+    print(f"Files: {len(reports)}  Total: {format_bytes(total)}  Estimated savings: {format_bytes(savings)}")
+
+    if duplicates:
+        print(f"\n♻️  Identical files ({len(duplicates)} groups):")
+        for paths in duplicates:
+            print(f"   {' = '.join(paths)}")
+
+    if Image is None and any(r.oversized for r in reports):
+        print("\nℹ️  Install Pillow (pip install Pillow) to downscale oversized images")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Odyseya asset weight analyzer and optimizer")
+    parser.add_argument('--optimize', action='store_true', help="Recompress and downscale assets in place")
+    parser.add_argument('--max-dimension', type=int, default=DEFAULT_MAX_DIMENSION,
+                        help=f"Longest side in pixels before an image counts as oversized (default {DEFAULT_MAX_DIMENSION})")
+    parser.add_argument('--workers', type=int, default=None, help="Worker threads")
+    parser.add_argument('--cache-size', type=float, default=DEFAULT_CACHE_BYTES / (1024 * 1024), metavar='MB',
+                        help="Bound for optimized images kept in .asset_cache/ (default: %(default)g)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    pipeline = AssetPipeline(Path(__file__).parent, args.max_dimension, args.workers,
+                             int(args.cache_size * 1024 * 1024))
+
+    reports = pipeline.analyze()
+    print_report(reports)
+
+    if args.optimize:
+        saved = pipeline.optimize(reports)
+        print(f"\n✅ Optimized assets, saved {format_bytes(saved)}")
+
+
+if __name__ == '__main__':
+    main()
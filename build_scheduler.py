@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Odyseya Build Scheduler
+Runs the Flutter release builds (iOS, Android app bundle, web) as a
+dependency graph: `flutter pub get` runs once, then every platform build
+that is ready starts as soon as a slot is free. Concurrency is bounded by
+CPU count and by available memory (each build has a rough memory cost),
+and every build writes to its own log under build/logs/.
+
+Usage: python3 build_scheduler.py [ios] [appbundle] [web] [--max-parallel N]
+"""
+
+import os
+import sys
+import time
+import argparse
+import platform
+import subprocess
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+PLATFORM_TARGETS = ('ios', 'appbundle', 'web')
+
+STATUS_ICONS = {
+    'ok': '✅',
+    'failed': '❌',
+    'blocked': '⛔',
+    'skipped': '⏭️ ',
+    'pending': '⏳',
+}
+
+
+class BuildTask:
+    """One node of the build graph"""
+
+    def __init__(self, name: str, command: str, deps=(), memory_mb: int = 0, requires: str = None,
+                 macos_only: bool = False, estimate_s: float = 0):
+        self.name = name
+        self.command = command
+        self.deps = list(deps)
+        self.memory_mb = memory_mb
+        self.estimate_s = estimate_s  # typical duration, for ordering ready tasks
+        self.requires = requires  # project directory the task needs (android/, web/)
+        self.macos_only = macos_only
+        self.status = 'pending'
+        self.reason = ''
+        self.started = None
+        self.duration = None
+        self.log_path: Optional[Path] = None
+
+
+def default_tasks(targets=PLATFORM_TARGETS) -> List[BuildTask]:
+    """Task graph for the requested platforms; pub get is shared by all of them"""
+    # --no-pub: dependencies are resolved once by the pub_get task
+    # Estimates are typical release-build times on a laptop, in seconds
+    tasks = [BuildTask('pub_get', 'flutter pub get', memory_mb=512, estimate_s=6)]
+    if 'ios' in targets:
+        tasks.append(BuildTask('pod_install', 'cd ios && pod install', ['pub_get'], 512, 'ios',
+                               macos_only=True, estimate_s=40))
+        tasks.append(BuildTask('ios', 'flutter build ios --release --no-codesign --no-pub',
+                               ['pod_install'], 4096, 'ios', macos_only=True, estimate_s=300))
+    if 'appbundle' in targets:
+        tasks.append(BuildTask('appbundle', 'flutter build appbundle --release --no-pub',
+                               ['pub_get'], 4096, 'android', estimate_s=240))
+    if 'web' in targets:
+        tasks.append(BuildTask('web', 'flutter build web --release --no-pub', ['pub_get'], 2048, 'web',
+                               estimate_s=90))
+    return tasks
+
+
+def available_memory_mb() -> Optional[int]:
+    """Memory available for new processes, or None when it cannot be determined"""
+    try:
+        with open('/proc/meminfo') as f:
+            for line in f:
+                if line.startswith('MemAvailable:'):
+                    return int(line.split()[1]) // 1024
+    except OSError:
+        pass
+
+    if platform.system() == 'Darwin':
+        try:
+            output = subprocess.run(['vm_stat'], capture_output=True, text=True, check=True).stdout
+        except (OSError, subprocess.CalledProcessError):
+            return None
+        page_size = 4096
+        pages = 0
+        for line in output.splitlines():
+            if 'page size of' in line:
+                page_size = int(line.split('page size of')[1].split()[0])
+            elif line.startswith(('Pages free:', 'Pages inactive:', 'Pages speculative:')):
+                pages += int(line.split(':')[1].strip().rstrip('.'))
+        return pages * page_size // (1024 * 1024)
+
+    return None
+
+
+def default_parallelism() -> int:
+    # Each Flutter/Gradle/Xcode build is itself multi-threaded
+    return max(1, (os.cpu_count() or 1) // 2)
+
+
+def run_logged(command: str, cwd: Path, log_path: Path) -> bool:
+    """Run a shell command with stdout/stderr going to log_path"""
+    with open(log_path, 'w') as log:
+        result = subprocess.run(command, shell=True, cwd=cwd, stdout=log, stderr=subprocess.STDOUT)
+    return result.returncode == 0
+
+
+class BuildScheduler:
+    """Runs a BuildTask graph with bounded concurrency"""
+
+    def __init__(self, project_root, tasks: List[BuildTask], max_parallel: int = None,
+                 memory_budget_mb: int = None, runner: Callable = None, on_finish: Callable = None,
+                 host_platform: str = None, log_dir=None):
+        self.project_root = Path(project_root)
+        self.host_platform = host_platform or platform.system()
+        self.tasks: Dict[str, BuildTask] = {task.name: task for task in tasks}
+        self.max_parallel = max_parallel or default_parallelism()
+        self.memory_budget_mb = memory_budget_mb if memory_budget_mb is not None else available_memory_mb()
+        self.runner = runner or (lambda command, log_path: run_logged(command, self.project_root, log_path))
+        self.on_finish = on_finish
+        self.log_dir = Path(log_dir) if log_dir else self.project_root / 'build' / 'logs'
+        self._condition = threading.Condition()
+        self._running: Dict[str, int] = {}
+
+        for task in tasks:
+            missing = [dep for dep in task.deps if dep not in self.tasks]
+            if missing:
+                raise ValueError(f"Task {task.name} depends on unknown task(s): {', '.join(missing)}")
+        self._check_acyclic()
+        self._remaining = self._critical_paths()
+
+    def _check_acyclic(self):
+        state = {}
+
+        def visit(name, path):
+            if state.get(name) == 'done':
+                return
+            if state.get(name) == 'visiting':
+                raise ValueError(f"Build graph has a cycle: {' -> '.join(path + [name])}")
+            state[name] = 'visiting'
+            for dep in self.tasks[name].deps:
+                visit(dep, path + [name])
+            state[name] = 'done'
+
+        for name in self.tasks:
+            visit(name, [])
+
+    def _critical_paths(self) -> Dict[str, float]:
+        """Estimated time from a task's start to the end of its longest chain of dependents"""
+        dependents = {name: [] for name in self.tasks}
+        for task in self.tasks.values():
+            for dep in task.deps:
+                dependents[dep].append(task.name)
+
+        remaining = {}
+
+        def visit(name):
+            if name not in remaining:
+                remaining[name] = self.tasks[name].estimate_s + max(
+                    (visit(child) for child in dependents[name]), default=0)
+            return remaining[name]
+
+        for name in self.tasks:
+            visit(name)
+        return remaining
+
+    def _skip_unsupported(self):
+        for task in self.tasks.values():
+            if task.macos_only and self.host_platform != 'Darwin':
+                task.status, task.reason = 'skipped', 'requires macOS'
+            elif task.requires and not (self.project_root / task.requires).is_dir():
+                task.status, task.reason = 'skipped', f"no {task.requires}/ directory"
+
+    def _ready(self) -> List[BuildTask]:
+        """Pending tasks whose dependencies all finished; blocks dependents of failures"""
+        ready = []
+        for task in self.tasks.values():
+            if task.status != 'pending' or task.name in self._running:
+                continue
+            dep_status = [self.tasks[dep].status for dep in task.deps]
+            if any(status in ('failed', 'blocked', 'skipped') for status in dep_status):
+                bad = next(dep for dep in task.deps if self.tasks[dep].status in ('failed', 'blocked', 'skipped'))
+                task.status, task.reason = 'blocked', f"{bad} {self.tasks[bad].status}"
+                continue
+            if all(status == 'ok' for status in dep_status):
+                ready.append(task)
+        # Longest remaining chain first (pod_install gates ios), so that chain
+        # is not the serial tail; memory only breaks ties
+        return sorted(ready, key=lambda t: (-self._remaining[t.name], -t.memory_mb))
+
+    def _fits(self, task: BuildTask) -> bool:
+        if len(self._running) >= self.max_parallel:
+            return False
+        if self.memory_budget_mb is None or not self._running:
+            return True  # a single build always runs, even on a small machine
+        return sum(self._running.values()) + task.memory_mb <= self.memory_budget_mb
+
+    def _execute(self, task: BuildTask):
+        task.log_path = self.log_dir / f"{task.name}.log"
+        start = time.monotonic()
+        try:
+            success = self.runner(task.command, task.log_path)
+        except Exception as e:
+            success, task.reason = False, str(e)
+        task.duration = time.monotonic() - start
+
+        with self._condition:
+            task.status = 'ok' if success else 'failed'
+            if not success and not task.reason:
+                try:
+                    task.reason = f"see {task.log_path.relative_to(self.project_root)}"
+                except ValueError:  # log_dir outside the project
+                    task.reason = f"see {task.log_path}"
+            try:
+                # Under the lock so progress lines do not interleave
+                if self.on_finish:
+                    self.on_finish(task)
+            finally:
+                # A failing callback must not leave run() waiting for this task
+                del self._running[task.name]
+                self._condition.notify_all()
+
+    def run(self) -> bool:
+        """Run the graph; returns True when every runnable task succeeded"""
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        self._skip_unsupported()
+        origin = time.monotonic()
+        threads = []
+
+        with self._condition:
+            while True:
+                for task in self._ready():
+                    if not self._fits(task):
+                        break
+                    task.started = time.monotonic() - origin
+                    self._running[task.name] = task.memory_mb
+                    print(f"▶️  {task.name}: {task.command}")
+                    thread = threading.Thread(target=self._execute, args=(task,), daemon=True)
+                    threads.append(thread)
+                    thread.start()
+
+                if not self._running and not self._ready():
+                    break
+                self._condition.wait()
+
+        for thread in threads:
+            thread.join()
+
+        return all(task.status in ('ok', 'skipped') for task in self.tasks.values())
+
+    def print_table(self):
+        """Consolidated status and timing table"""
+        width = max(len(name) for name in self.tasks)
+        print(f"\n   {'Task'.ljust(width)}  {'Status':<9}  {'Start':>7}  {'Time':>7}  Notes")
+        for task in self.tasks.values():
+            start = f"{task.started:.1f}s" if task.started is not None else '-'
+            duration = f"{task.duration:.1f}s" if task.duration is not None else '-'
+            icon = STATUS_ICONS.get(task.status, '')
+            print(f"   {task.name.ljust(width)}  {icon}{task.status:<7}  {start:>7}  {duration:>7}  {task.reason}")
+
+        finished = [t for t in self.tasks.values() if t.duration is not None]
+        if finished:
+            wall = max(t.started + t.duration for t in finished)
+            serial = sum(t.duration for t in finished)
+            print(f"\n   Wall time: {wall:.1f}s (serial would be {serial:.1f}s)")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Parallel Flutter release builds")
+    parser.add_argument('targets', nargs='*', metavar='TARGET',
+                        help=f"Platforms to build: {', '.join(PLATFORM_TARGETS)} (default: all)")
+    parser.add_argument('--max-parallel', type=int, default=None,
+                        help="Concurrent builds (default: half the CPU count)")
+    parser.add_argument('--memory-budget', type=int, default=None,
+                        help="Memory budget in MB (default: currently available memory)")
+    args = parser.parse_args()
+    unknown = [target for target in args.targets if target not in PLATFORM_TARGETS]
+    if unknown:
+        parser.error(f"unknown target(s): {', '.join(unknown)}")
+    return args
+
+
+def main():
+    args = parse_args()
+    project_root = Path(__file__).parent
+    scheduler = BuildScheduler(project_root, default_tasks(args.targets or PLATFORM_TARGETS),
+                               args.max_parallel, args.memory_budget)
+    print(f"🔨 Building {', '.join(args.targets or PLATFORM_TARGETS)} "
+          f"(max {scheduler.max_parallel} parallel"
+          f"{f', {scheduler.memory_budget_mb} MB budget' if scheduler.memory_budget_mb else ''})\n")
+    success = scheduler.run()
+    scheduler.print_table()
+    sys.exit(0 if success else 1)
+
+
+if __name__ == '__main__':
+    main()
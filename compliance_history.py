@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+Odyseya Compliance History
+Keeps every compliance audit in a local SQLite database so trends and
+regressions can be queried without re-scanning the tree.
+
+Each file is stored as versions that stay valid over a range of runs
+(first_run .. last_run, NULL while current). A run only writes rows for
+files whose content or violations changed, plus per-rule totals for the
+run, so recording an audit of an unchanged tree is a handful of inserts.
+
+Usage:
+  python3 odyseya_compliance_agent.py --history          # record an audit
+  python3 compliance_history.py runs [--limit N]
+  python3 compliance_history.py trend [--runs 50] [--rule RULE]
+  python3 compliance_history.py regressions [--limit 10]
+  python3 compliance_history.py file lib/screens/settings/settings_screen.dart
+"""
+
+import sys
+import sqlite3
+import hashlib
+import argparse
+import subprocess
+from collections import Counter, defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+DEFAULT_DB = Path('reports') / 'compliance_history.sqlite'
+
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    started_at TEXT NOT NULL,
+    commit_sha TEXT,
+    files_checked INTEGER NOT NULL,
+    violations INTEGER NOT NULL,
+    files_changed INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS file_versions (
+    id INTEGER PRIMARY KEY,
+    file_id INTEGER NOT NULL REFERENCES files(id),
+    state_hash TEXT NOT NULL,
+    first_run INTEGER NOT NULL REFERENCES runs(id),
+    last_run INTEGER REFERENCES runs(id),
+    violations INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS violations (
+    id INTEGER PRIMARY KEY,
+    version_id INTEGER NOT NULL REFERENCES file_versions(id),
+    line INTEGER NOT NULL,
+    severity TEXT NOT NULL,
+    rule TEXT NOT NULL,
+    message TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS run_rule_counts (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    rule TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (run_id, rule)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_versions_file ON file_versions(file_id, first_run);
+CREATE INDEX IF NOT EXISTS idx_versions_current ON file_versions(last_run) WHERE last_run IS NULL;
+CREATE INDEX IF NOT EXISTS idx_versions_runs ON file_versions(first_run, last_run);
+CREATE INDEX IF NOT EXISTS idx_violations_version ON violations(version_id);
+CREATE INDEX IF NOT EXISTS idx_violations_rule ON violations(rule, version_id);
+CREATE INDEX IF NOT EXISTS idx_rule_counts_rule ON run_rule_counts(rule, run_id);
+"""
+
+
+def current_commit(project_root) -> Optional[str]:
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=project_root,
+                                capture_output=True, text=True)
+    except OSError:
+        return None
+    return result.stdout.strip() or None
+
+
+class ComplianceHistory:
+    """SQLite store of compliance runs"""
+
+    def __init__(self, db_path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute('PRAGMA foreign_keys=ON')
+        self.conn.executescript(SCHEMA)
+        self.conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('schema_version', ?)",
+                          (str(SCHEMA_VERSION),))
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @staticmethod
+    def _relative(path, project_root: Path) -> str:
+        try:
+            return Path(path).resolve().relative_to(project_root).as_posix()
+        except ValueError:
+            return Path(path).as_posix()
+
+    def record(self, project_root, files: List[Path], violations, commit_sha: str = None) -> int:
+        """Store one audit; only files whose content or violations changed get new rows"""
+        project_root = Path(project_root).resolve()
+
+        by_file = defaultdict(list)
+        for v in violations:
+            by_file[self._relative(v.file_path, project_root)].append(v)
+
+        # Content + violations: a rule change re-records a file even if its source did not change
+        states = {}
+        for file_path in files:
+            rel_path = self._relative(file_path, project_root)
+            digest = hashlib.sha1()
+            try:
+                digest.update(Path(file_path).read_bytes())
+            except OSError:
+                pass
+            for v in by_file.get(rel_path, []):
+                digest.update(f"\0{v.line}\0{v.vtype}\0{v.message}".encode('utf-8'))
+            states[rel_path] = digest.hexdigest()
+
+        with self.conn:
+            cursor = self.conn.execute(
+                'INSERT INTO runs (started_at, commit_sha, files_checked, violations, files_changed) '
+                'VALUES (?, ?, ?, ?, 0)',
+                (datetime.now().isoformat(timespec='seconds'), commit_sha, len(states), len(violations))
+            )
+            run_id = cursor.lastrowid
+            previous_run = self.conn.execute('SELECT MAX(id) FROM runs WHERE id < ?', (run_id,)).fetchone()[0]
+
+            current = {
+                path: (version_id, state_hash)
+                for path, version_id, state_hash in self.conn.execute(
+                    'SELECT f.path, fv.id, fv.state_hash FROM file_versions fv '
+                    'JOIN files f ON f.id = fv.file_id WHERE fv.last_run IS NULL'
+                )
+            }
+
+            # Versions that changed or whose file was not part of this run end at the previous run
+            self.conn.executemany(
+                'UPDATE file_versions SET last_run = ? WHERE id = ?',
+                [(previous_run, version_id) for path, (version_id, state_hash) in current.items()
+                 if states.get(path) != state_hash]
+            )
+
+            changed = [path for path, state_hash in states.items()
+                       if path not in current or current[path][1] != state_hash]
+            for path in changed:
+                self.conn.execute('INSERT OR IGNORE INTO files (path) VALUES (?)', (path,))
+                file_id = self.conn.execute('SELECT id FROM files WHERE path = ?', (path,)).fetchone()[0]
+                file_violations = by_file.get(path, [])
+                version_id = self.conn.execute(
+                    'INSERT INTO file_versions (file_id, state_hash, first_run, violations) VALUES (?, ?, ?, ?)',
+                    (file_id, states[path], run_id, len(file_violations))
+                ).lastrowid
+                self.conn.executemany(
+                    'INSERT INTO violations (version_id, line, severity, rule, message) VALUES (?, ?, ?, ?, ?)',
+                    [(version_id, v.line, v.severity, v.vtype, v.message) for v in file_violations]
+                )
+
+            self.conn.executemany(
+                'INSERT INTO run_rule_counts (run_id, rule, count) VALUES (?, ?, ?)',
+                [(run_id, rule, count) for rule, count in Counter(v.vtype for v in violations).items()]
+            )
+            self.conn.execute('UPDATE runs SET files_changed = ? WHERE id = ?', (len(changed), run_id))
+
+        return run_id
+
+    def runs(self, limit: int = 20) -> List[tuple]:
+        """(id, started_at, commit, files_checked, violations, files_changed), newest first"""
+        return self.conn.execute(
+            'SELECT id, started_at, commit_sha, files_checked, violations, files_changed '
+            'FROM runs ORDER BY id DESC LIMIT ?', (limit,)
+        ).fetchall()
+
+    def trend(self, runs: int = 50, rule: str = None) -> Dict[str, List[tuple]]:
+        """{rule: [(run_id, count), ...]} over the last N runs, oldest first"""
+        # One row per (rule, run), zero-filled for runs where a rule had no violations
+        query = (
+            'SELECT rules.rule, r.id, COALESCE(c.count, 0) '
+            'FROM (SELECT id FROM runs ORDER BY id DESC LIMIT ?) r '
+            'CROSS JOIN (SELECT DISTINCT rule FROM run_rule_counts WHERE ? IS NULL OR rule = ?) rules '
+            'LEFT JOIN run_rule_counts c ON c.run_id = r.id AND c.rule = rules.rule '
+            'ORDER BY rules.rule, r.id'
+        )
+        result = defaultdict(list)
+        for rule_name, run_id, count in self.conn.execute(query, (runs, rule, rule)):
+            result[rule_name].append((run_id, count))
+        return dict(result)
+
+    def regressions(self, limit: int = 10, runs: int = None) -> List[tuple]:
+        """(path, regressions, latest violations): files whose violation count went up most often"""
+        since = 0
+        if runs:
+            row = self.conn.execute('SELECT MIN(id) FROM (SELECT id FROM runs ORDER BY id DESC LIMIT ?)',
+                                    (runs,)).fetchone()
+            since = row[0] or 0
+        return self.conn.execute(
+            'SELECT path, SUM(delta > 0) AS regressions, '
+            '       (SELECT fv.violations FROM file_versions fv WHERE fv.file_id = d.file_id '
+            '        ORDER BY fv.first_run DESC LIMIT 1) '
+            'FROM ('
+            '  SELECT f.path, fv.file_id, fv.first_run, '
+            '         fv.violations - LAG(fv.violations) OVER (PARTITION BY fv.file_id ORDER BY fv.first_run) AS delta '
+            '  FROM file_versions fv JOIN files f ON f.id = fv.file_id'
+            ') d '
+            'WHERE first_run >= ? '
+            'GROUP BY path HAVING regressions > 0 '
+            'ORDER BY regressions DESC, path LIMIT ?',
+            (since, limit)
+        ).fetchall()
+
+    def file_history(self, path: str) -> List[tuple]:
+        """(first_run, last_run, violations, rules) for each recorded version of a file"""
+        return self.conn.execute(
+            'SELECT fv.first_run, fv.last_run, fv.violations, '
+            '       (SELECT GROUP_CONCAT(rule, \', \') FROM (SELECT DISTINCT rule FROM violations '
+            '        WHERE version_id = fv.id)) '
+            'FROM file_versions fv JOIN files f ON f.id = fv.file_id '
+            'WHERE f.path = ? ORDER BY fv.first_run',
+            (path,)
+        ).fetchall()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Query Odyseya compliance history")
+    parser.add_argument('--db', type=Path, default=Path(__file__).parent / DEFAULT_DB, help="History database")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    runs = commands.add_parser('runs', help="Recent runs")
+    runs.add_argument('--limit', type=int, default=20)
+
+    trend = commands.add_parser('trend', help="Violations per rule over recent runs")
+    trend.add_argument('--runs', type=int, default=50)
+    trend.add_argument('--rule')
+
+    regressions = commands.add_parser('regressions', help="Files whose violation count rises most often")
+    regressions.add_argument('--limit', type=int, default=10)
+    regressions.add_argument('--runs', type=int, default=None, help="Only consider the last N runs")
+
+    file_history = commands.add_parser('file', help="Recorded versions of one file")
+    file_history.add_argument('path')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if not args.db.exists():
+        print(f"❌ No history at {args.db} (run the compliance agent with --history first)")
+        sys.exit(1)
+
+    with ComplianceHistory(args.db) as history:
+        if args.command == 'runs':
+            print(f"{'Run':>5}  {'Started':<19}  {'Commit':<9}  {'Files':>5}  {'Violations':>10}  {'Changed':>7}")
+            for run_id, started_at, commit_sha, files_checked, violations, changed in history.runs(args.limit):
+                print(f"{run_id:>5}  {started_at:<19}  {commit_sha or '-':<9}  {files_checked:>5}  "
+                      f"{violations:>10}  {changed:>7}")
+
+        elif args.command == 'trend':
+            trend = history.trend(args.runs, args.rule)
+            if not trend:
+                print("No runs recorded")
+                return
+            width = max(len(rule) for rule in trend)
+            for rule, points in sorted(trend.items()):
+                counts = [count for _, count in points]
+                print(f"{rule.ljust(width)}  first {counts[0]:>4}  last {counts[-1]:>4}  "
+                      f"min {min(counts):>4}  max {max(counts):>4}  ({len(counts)} runs)")
+
+        elif args.command == 'regressions':
+            rows = history.regressions(args.limit, args.runs)
+            if not rows:
+                print("✅ No file has regressed")
+                return
+            print(f"{'Regressions':>11}  {'Now':>4}  File")
+            for path, regressions, latest in rows:
+                print(f"{regressions:>11}  {latest:>4}  {path}")
+
+        elif args.command == 'file':
+            rows = history.file_history(args.path)
+            if not rows:
+                print(f"No history for {args.path}")
+                return
+            for first_run, last_run, violations, rules in rows:
+                span = f"runs {first_run}-{last_run if last_run is not None else 'now'}"
+                print(f"{span:<16}  {violations:>4} violations  {rules or ''}")
+
+
+if __name__ == '__main__':
+    main()
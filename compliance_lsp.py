@@ -0,0 +1,315 @@
+#!/usr/bin/env python3
+"""
+Odyseya Compliance Language Server
+Runs the compliance rules inside the editor: an LSP server over stdio
+that publishes violations as diagnostics while a Dart file is edited.
+
+One OdyseyaComplianceAgent is built at startup (rules, palette and
+contrast table stay warm). Each open document keeps the scanner state at
+the start of every line plus the violations found on it, so an edit only
+re-checks a window around the changed lines. The re-check stops as soon
+as the scanner state after the edit matches the cached one again; the
+remaining lines reuse their cached results.
+
+Usage (editor config): python3 compliance_lsp.py [--stdio]
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+from typing import Dict, List
+from urllib.parse import unquote, urlparse
+
+if os.name == 'nt':
+    from nturl2path import url2pathname
+else:
+    # What urllib.request uses on POSIX, without importing http.client and email (~30 ms)
+    url2pathname = unquote
+
+from odyseya_compliance_agent import ComplianceViolation, Frame, OdyseyaComplianceAgent, ScanContext
+
+# How far a rule can see around its line: call_text() reads up to 30 lines
+# from where a call opens, so edits affect results this many lines away
+RULE_WINDOW = 30
+
+REQUESTS = {'initialize', 'shutdown'}  # everything else handled is a notification
+
+# JSON-RPC / LSP error codes
+PARSE_ERROR = -32700
+METHOD_NOT_FOUND = -32601
+INTERNAL_ERROR = -32603
+SERVER_NOT_INITIALIZED = -32002
+
+SEVERITY_LEVELS = {'CRITICAL': 1, 'HIGH': 2, 'MEDIUM': 3, 'LOW': 4}  # Error, Warning, Information, Hint
+
+
+def uri_to_path(uri: str) -> Path:
+    parsed = urlparse(uri)
+    return Path(url2pathname(unquote(parsed.path)))
+
+
+def utf16_to_index(line: str, character: int) -> int:
+    """Convert an LSP (UTF-16) column to a Python string index"""
+    units = 0
+    for index, ch in enumerate(line):
+        if units >= character:
+            return index
+        units += 2 if ord(ch) > 0xFFFF else 1
+    return len(line)
+
+
+def utf16_length(text: str) -> int:
+    return sum(2 if ord(ch) > 0xFFFF else 1 for ch in text)
+
+
+class Document:
+    """An open document with per-line scanner state and violations"""
+
+    def __init__(self, agent: OdyseyaComplianceAgent, uri: str, text: str):
+        self.agent = agent
+        self.uri = uri
+        self.path = uri_to_path(uri)
+        self.check_colors = agent.checks_colors(self.path)
+        self.lines: List[str] = text.splitlines(keepends=True)
+        self.states: List[tuple] = []  # scanner state at the start of each line
+        self.violations: List[List[ComplianceViolation]] = []
+        self.lines_checked = 0  # lines re-checked by the last update
+        self.check(0)
+
+    @staticmethod
+    def snapshot(context: ScanContext) -> tuple:
+        frames = tuple((f.name, f.line, f.column, f.background, f.const) for f in context.frames)
+        return frames, tuple(context.regions)
+
+    def restore(self, context: ScanContext, index: int):
+        frames, regions = self.states[index] if index < len(self.states) else ((), ())
+        context.index = index - 1
+        context.frames = []
+        for name, line, column, background, const in frames:
+            frame = Frame(name, line, column)
+            frame.background = background
+            frame.const = const
+            context.frames.append(frame)
+        context.regions = list(regions)
+
+    def check(self, start: int, old_states=None, old_violations=None, changed_end: int = 0, delta: int = 0):
+        """Re-check from line start; with old results, stop once the state converges after changed_end"""
+        context = ScanContext(self.lines)
+        self.restore(context, start)
+        del self.states[start:]
+        del self.violations[start:]
+
+        i = start
+        while i < len(self.lines):
+            state = self.snapshot(context)
+            old = i - delta
+            if old_states is not None and i > changed_end + RULE_WINDOW and 0 <= old < len(old_states):
+                if self.shifted(old_states[old], changed_end - delta, delta) == state:
+                    # Same text and same scanner state from here on: reuse the old results
+                    self.states.extend(self.shifted(s, changed_end - delta, delta) for s in old_states[old:])
+                    self.violations.extend(old_violations[old:])
+                    break
+
+            self.states.append(state)
+            context.enter_line(self.lines[i])
+            collected, self.agent.violations = self.agent.violations, []
+            try:
+                self.agent.check_line(self.path, i + 1, self.lines[i], context, self.check_colors)
+                self.violations.append(self.agent.violations)
+            finally:
+                self.agent.violations = collected
+            context.exit_line()
+            i += 1
+
+        self.lines_checked = i - start
+
+    @staticmethod
+    def shifted(state: tuple, old_changed_end: int, delta: int) -> tuple:
+        """Old state with frame line numbers moved past the edit"""
+        if not delta:
+            return state
+        frames, regions = state
+        return tuple((name, line + delta if line > old_changed_end else line, column, background, const)
+                     for name, line, column, background, const in frames), regions
+
+    def apply_change(self, change: Dict):
+        """Apply one textDocument/didChange content change and re-check what it can affect"""
+        if 'range' not in change:
+            self.lines = change['text'].splitlines(keepends=True)
+            self.states, self.violations = [], []
+            self.check(0)
+            return
+
+        start, end = change['range']['start'], change['range']['end']
+        first, last = start['line'], end['line']
+        prefix_line = self.lines[first] if first < len(self.lines) else ''
+        suffix_line = self.lines[last] if last < len(self.lines) else ''
+        prefix = prefix_line[:utf16_to_index(prefix_line, start['character'])]
+        suffix = suffix_line[utf16_to_index(suffix_line, end['character']):]
+
+        new_lines = (prefix + change['text'] + suffix).splitlines(keepends=True)
+        old_count = max(0, min(last, len(self.lines) - 1) - first + 1)
+        self.lines[first:first + old_count] = new_lines
+        delta = len(new_lines) - old_count
+
+        old_states, old_violations = self.states, self.violations
+        self.states, self.violations = list(old_states), list(old_violations)
+        changed_end = first + len(new_lines) - 1
+        self.check(max(0, first - RULE_WINDOW), old_states, old_violations, changed_end, delta)
+
+    def diagnostics(self) -> List[Dict]:
+        result = []
+        for index, line_violations in enumerate(self.violations):
+            for v in line_violations:
+                text = self.lines[index].rstrip('\r\n')
+                indent = len(text) - len(text.lstrip())
+                result.append({
+                    'range': {
+                        'start': {'line': index, 'character': utf16_length(text[:indent])},
+                        'end': {'line': index, 'character': utf16_length(text)},
+                    },
+                    'severity': SEVERITY_LEVELS.get(v.severity, 3),
+                    'code': v.vtype,
+                    'source': 'odyseya',
+                    'message': f"{v.message}\nFix: {v.fix}" if v.fix else v.message,
+                })
+        return result
+
+
+class ComplianceLanguageServer:
+    """Minimal LSP server: open/change/close documents and publish diagnostics"""
+
+    def __init__(self, stdin=None, stdout=None):
+        self.stdin = stdin or sys.stdin.buffer
+        self.stdout = stdout or sys.stdout.buffer
+        self.agent = None
+        self.documents: Dict[str, Document] = {}
+        self.running = True
+
+    def read_message(self):
+        """Next message; None at end of input, ValueError for a malformed one"""
+        headers = {}
+        while True:
+            line = self.stdin.readline()
+            if not line:
+                return None
+            line = line.decode('ascii').strip()
+            if not line:
+                break
+            name, _, value = line.partition(':')
+            headers[name.strip().lower()] = value.strip()
+        if 'content-length' not in headers:
+            raise ValueError("Missing Content-Length header")
+        body = self.stdin.read(int(headers['content-length']))
+        try:
+            message = json.loads(body.decode('utf-8'))
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            raise ValueError(f"Invalid message body: {e}")
+        if not isinstance(message, dict):
+            raise ValueError("Message is not a JSON object")
+        return message
+
+    def send(self, message: Dict):
+        body = json.dumps(message).encode('utf-8')
+        self.stdout.write(f"Content-Length: {len(body)}\r\n\r\n".encode('ascii') + body)
+        self.stdout.flush()
+
+    def notify(self, method: str, params: Dict):
+        self.send({'jsonrpc': '2.0', 'method': method, 'params': params})
+
+    def publish(self, document: Document, started: float):
+        self.notify('textDocument/publishDiagnostics', {'uri': document.uri, 'diagnostics': document.diagnostics()})
+        self.notify('window/logMessage', {
+            'type': 4,
+            'message': f"odyseya: {document.path.name} re-checked {document.lines_checked}/{len(document.lines)} "
+                       f"lines in {(time.perf_counter() - started) * 1000:.1f} ms",
+        })
+
+    def handle(self, message: Dict):
+        method = message.get('method')
+        params = message.get('params') or {}
+        started = time.perf_counter()
+
+        if method == 'initialize':
+            root = params.get('rootUri')
+            project_root = uri_to_path(root) if root else Path(params.get('rootPath') or os.getcwd())
+            self.agent = OdyseyaComplianceAgent(project_root)
+            return {
+                'capabilities': {
+                    'textDocumentSync': {'openClose': True, 'change': 2},  # 2 = incremental
+                },
+                'serverInfo': {'name': 'odyseya-compliance'},
+            }
+        if method == 'shutdown':
+            return None
+        if method == 'exit':
+            self.running = False
+            return None
+
+        if method == 'textDocument/didOpen':
+            item = params['textDocument']
+            if item.get('languageId', 'dart') == 'dart' or item['uri'].endswith('.dart'):
+                document = Document(self.agent, item['uri'], item['text'])
+                self.documents[item['uri']] = document
+                self.publish(document, started)
+        elif method == 'textDocument/didChange':
+            document = self.documents.get(params['textDocument']['uri'])
+            if document:
+                for change in params['contentChanges']:
+                    document.apply_change(change)
+                self.publish(document, started)
+        elif method == 'textDocument/didClose':
+            uri = params['textDocument']['uri']
+            if self.documents.pop(uri, None):
+                self.notify('textDocument/publishDiagnostics', {'uri': uri, 'diagnostics': []})
+        return None
+
+    def serve(self):
+        while self.running:
+            try:
+                message = self.read_message()
+            except ValueError as e:
+                self.send({'jsonrpc': '2.0', 'id': None, 'error': {'code': PARSE_ERROR, 'message': str(e)}})
+                continue
+            if message is None:
+                break
+
+            method = message.get('method')
+            result, error = None, None
+            if self.agent is None and method not in ('initialize', 'exit'):
+                # Requests get an error; notifications before initialize are dropped
+                error = {'code': SERVER_NOT_INITIALIZED, 'message': "Server not initialized"}
+            elif 'id' in message and method not in REQUESTS:
+                error = {'code': METHOD_NOT_FOUND, 'message': f"Unsupported method: {method}"}
+            else:
+                try:
+                    result = self.handle(message)
+                except Exception as e:
+                    error = {'code': INTERNAL_ERROR, 'message': str(e)}
+
+            if 'id' in message and 'method' in message:
+                response = {'jsonrpc': '2.0', 'id': message['id']}
+                if error:
+                    response['error'] = error
+                else:
+                    response['result'] = result
+                self.send(response)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Odyseya compliance language server (LSP over stdio)")
+    # Editor clients commonly pass --stdio; it is the only transport
+    parser.add_argument('--stdio', action='store_true', help="Serve over stdin/stdout (the default)")
+    return parser.parse_args()
+
+
+def main():
+    parse_args()
+    ComplianceLanguageServer().serve()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Odyseya Fix-Plan Cache
+Content-addressed store of computed rewrites for the source fixers
+(remove_hardcoded_styles.py).
+
+A plan is the list of edits a transform makes to one file, as
+(start, end, replacement) spans over the original text. Entries are keyed
+by the hash of the file content plus the transform's version string, so a
+rerun over unchanged files (CI branches, fresh checkouts) applies the
+cached edits, or skips the file when the plan is empty, without running
+the transform again. Changing the transform changes its version and
+misses every old entry; those age out.
+
+The cache lives in .fix_cache/<transform>.json and is bounded in bytes:
+least recently used entries are evicted first.
+
+Usage: python3 fix_cache.py [stats|clear] [--transform NAME]
+"""
+
+import os
+import sys
+import json
+import hashlib
+import argparse
+from collections import OrderedDict
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+CACHE_DIR = '.fix_cache'
+CACHE_FORMAT = 1
+
+# Shared runners keep the cache small; 4 MB holds plans for thousands of files
+DEFAULT_MAX_BYTES = 4 * 1024 * 1024
+
+Edit = Tuple[int, int, str]
+
+
+def plan_key(content: str, version: str) -> str:
+    """Cache key: hash of the transform version and the file content"""
+    digest = hashlib.sha256(version.encode('utf-8'))
+    digest.update(b'\0')
+    digest.update(content.encode('utf-8'))
+    return digest.hexdigest()
+
+
+def apply_plan(content: str, plan: List[Edit]) -> str:
+    """Apply non-overlapping (start, end, replacement) edits, given in order"""
+    parts = []
+    position = 0
+    for start, end, replacement in plan:
+        parts.append(content[position:start])
+        parts.append(replacement)
+        position = end
+    parts.append(content[position:])
+    return ''.join(parts)
+
+
+class FixPlanCache:
+    """Size-bounded LRU cache of fix plans for one transform"""
+
+    def __init__(self, project_root, transform: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = Path(project_root) / CACHE_DIR / f"{transform}.json"
+        self.max_bytes = max_bytes
+        self.entries: 'OrderedDict[str, list]' = OrderedDict()  # oldest use first
+        self.size = 0
+        self.hits = self.misses = self.evicted = 0
+        self.dirty = False
+        self.saved_order: List[str] = []  # key order of the file on disk
+        self.load()
+
+    @staticmethod
+    def entry_size(key: str, plan: list) -> int:
+        # Approximately what the entry costs in the JSON file
+        return len(key) + sum(len(replacement.encode('utf-8')) + 24 for _, _, replacement in plan) + 8
+
+    def load(self):
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return
+        if data.get('format') != CACHE_FORMAT:
+            return
+        for key, plan in data.get('entries', []):
+            self.entries[key] = plan
+            self.size += self.entry_size(key, plan)
+        self.saved_order = list(self.entries)
+        self.evict()
+
+    def save(self):
+        """Write the cache back atomically (only when entries or their order changed)"""
+        # A rerun that hits every entry in the same order as last time changes nothing
+        if not self.dirty and list(self.entries) == self.saved_order:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'w') as f:
+            # A list keeps the LRU order through the round trip
+            json.dump({'format': CACHE_FORMAT, 'entries': list(self.entries.items())}, f, separators=(',', ':'))
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+        self.saved_order = list(self.entries)
+
+    def get(self, key: str) -> Optional[List[Edit]]:
+        plan = self.entries.get(key)
+        if plan is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)  # save() writes the new order only if it differs from the file's
+        return [tuple(edit) for edit in plan]
+
+    def put(self, key: str, plan: List[Edit]):
+        if key in self.entries:
+            self.size -= self.entry_size(key, self.entries.pop(key))
+        plan = [list(edit) for edit in plan]
+        self.entries[key] = plan
+        self.size += self.entry_size(key, plan)
+        self.dirty = True
+        self.evict()
+
+    def evict(self):
+        while self.size > self.max_bytes and self.entries:
+            key, plan = self.entries.popitem(last=False)
+            self.size -= self.entry_size(key, plan)
+            self.evicted += 1
+            self.dirty = True
+
+    def clear(self):
+        self.entries.clear()
+        self.size = 0
+        self.dirty = True
+
+    def summary(self) -> str:
+        return (f"{self.hits} cached, {self.misses} computed, {len(self.entries)} entries "
+                f"({self.size / 1024:.0f} KB of {self.max_bytes / 1024:.0f} KB), {self.evicted} evicted")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Inspect or clear the fix-plan cache")
+    parser.add_argument('command', choices=['stats', 'clear'], nargs='?', default='stats')
+    parser.add_argument('--transform', action='append', metavar='NAME',
+                        help="Transform cache to use (repeatable, default: all in .fix_cache/)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    project_root = Path(__file__).parent
+    cache_dir = project_root / CACHE_DIR
+    transforms = args.transform or sorted(p.stem for p in cache_dir.glob('*.json'))
+    if not transforms:
+        print(f"📭 No fix-plan caches in {cache_dir}")
+        return
+
+    for transform in transforms:
+        cache = FixPlanCache(project_root, transform, max_bytes=sys.maxsize)
+        if args.command == 'clear':
+            cache.clear()
+            cache.save()
+            print(f"🧹 Cleared {transform}")
+        else:
+            changing = sum(1 for plan in cache.entries.values() if plan)
+            print(f"🗃️  {transform}: {len(cache.entries)} plans ({changing} with edits), {cache.size / 1024:.0f} KB")
+
+
+if __name__ == '__main__':
+    main()
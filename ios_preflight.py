@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Odyseya iOS Pre-flight Validator
+Static checks for the iOS project that App Store Connect would otherwise
+reject after a full archive/upload cycle. Reads only PNG headers and plist
+metadata, so it is cheap enough to gate every build.
+
+Usage: python3 ios_preflight.py [project_root]
+"""
+
+import sys
+import json
+import time
+import struct
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+
+ICON_SET = Path('ios/Runner/Assets.xcassets/AppIcon.appiconset')
+INFO_PLIST = Path('ios/Runner/Info.plist')
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+# IHDR colour types that carry an alpha channel
+PNG_ALPHA_COLOR_TYPES = {4, 6}
+
+# Keys App Store Connect expects in Runner/Info.plist
+REQUIRED_BUNDLE_KEYS = [
+    'CFBundleIdentifier',
+    'CFBundleShortVersionString',
+    'CFBundleVersion',
+    'CFBundleDisplayName',
+]
+
+# Usage descriptions for the permissions the app requests
+REQUIRED_USAGE_DESCRIPTIONS = [
+    ('NSMicrophoneUsageDescription', 'Microphone'),
+    ('NSUserNotificationsUsageDescription', 'Notifications'),
+    ('NSLocationWhenInUseUsageDescription', 'Location'),
+    ('NSPhotoLibraryUsageDescription', 'Photo Library'),
+    ('NSPhotoLibraryAddUsageDescription', 'Photo Library (add)'),
+]
+
+
+class PreflightIssue:
+    """Represents a pre-flight problem"""
+
+    def __init__(self, severity: str, check: str, message: str, path: str = None):
+        self.severity = severity  # ERROR or WARNING
+        self.check = check  # icons or plist
+        self.message = message
+        self.path = path
+
+
+def parse_png_header(header: bytes) -> Optional[Tuple[int, int, int]]:
+    """Return (width, height, color_type) from the first 26 bytes of a PNG"""
+    if len(header) < 26 or header[:8] != PNG_SIGNATURE or header[12:16] != b'IHDR':
+        return None
+
+    width, height = struct.unpack('>II', header[16:24])
+    return width, height, header[25]
+
+
+def read_png_header(path: Path) -> Optional[Tuple[int, int, int]]:
+    """Return (width, height, color_type) from the PNG IHDR chunk"""
+    try:
+        with open(path, 'rb') as f:
+            header = f.read(26)
+    except OSError:
+        return None
+
+    return parse_png_header(header)
+
+
+def expected_pixels(size: str, scale: str) -> Optional[Tuple[int, int]]:
+    """Convert a Contents.json size/scale pair (e.g. 83.5x83.5 @ 2x) to pixels"""
+    try:
+        points_w, points_h = (float(p) for p in size.split('x'))
+        factor = float(scale.rstrip('x'))
+    except (AttributeError, ValueError):
+        return None
+    return round(points_w * factor), round(points_h * factor)
+
+
+def check_app_icons(project_root: Path) -> List[PreflightIssue]:
+    """Verify every icon declared in Contents.json exists with the right dimensions"""
+    issues = []
+    icon_dir = project_root / ICON_SET
+    contents_path = icon_dir / 'Contents.json'
+
+    if not contents_path.exists():
+        return [PreflightIssue('ERROR', 'icons', "AppIcon.appiconset/Contents.json not found", str(icon_dir))]
+
+    try:
+        with open(contents_path, 'r', encoding='utf-8') as f:
+            contents = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        return [PreflightIssue('ERROR', 'icons', f"Contents.json is not valid JSON: {e}", str(contents_path))]
+
+    images = contents.get('images', [])
+    if not any(image.get('idiom') == 'ios-marketing' for image in images):
+        issues.append(PreflightIssue('ERROR', 'icons', "Missing 1024x1024 ios-marketing icon", str(contents_path)))
+
+    for image in images:
+        size = image.get('size')
+        scale = image.get('scale')
+        filename = image.get('filename')
+        label = f"{image.get('idiom')} {size}@{scale}"
+
+        if not filename:
+            issues.append(PreflightIssue('ERROR', 'icons', f"No file assigned for {label}", str(contents_path)))
+            continue
+
+        icon_path = icon_dir / filename
+        header = read_png_header(icon_path)
+        if header is None:
+            issues.append(PreflightIssue('ERROR', 'icons', f"{filename} is missing or not a PNG", str(icon_path)))
+            continue
+
+        width, height, color_type = header
+        expected = expected_pixels(size, scale)
+        if expected is None:
+            issues.append(PreflightIssue('WARNING', 'icons', f"Unrecognised size/scale for {label}", str(icon_path)))
+        elif (width, height) != expected:
+            issues.append(PreflightIssue(
+                'ERROR', 'icons',
+                f"{filename} is {width}x{height}px, {label} requires {expected[0]}x{expected[1]}px",
+                str(icon_path)
+            ))
+
+        if image.get('idiom') == 'ios-marketing' and color_type in PNG_ALPHA_COLOR_TYPES:
+            issues.append(PreflightIssue(
+                'ERROR', 'icons',
+                f"{filename} has an alpha channel (App Store icons must be opaque)",
+                str(icon_path)
+            ))
+
+    return issues
+
+
+def check_info_plist(project_root: Path) -> List[PreflightIssue]:
+    """Verify Info.plist parses and carries the required keys"""
+    plist_path = project_root / INFO_PLIST
+    if not plist_path.exists():
+        return [PreflightIssue('ERROR', 'plist', "Info.plist not found", str(plist_path))]
+
+    # Not at module level: the compliance audit imports this module for PNG headers only
+    import plistlib
+    try:
+        with open(plist_path, 'rb') as f:
+            plist = plistlib.load(f)
+    except (OSError, plistlib.InvalidFileException, ValueError) as e:
+        return [PreflightIssue('ERROR', 'plist', f"Info.plist could not be parsed: {e}", str(plist_path))]
+
+    issues = []
+    for key in REQUIRED_BUNDLE_KEYS:
+        if not plist.get(key):
+            issues.append(PreflightIssue('ERROR', 'plist', f"Missing bundle key: {key}", str(plist_path)))
+
+    for key, name in REQUIRED_USAGE_DESCRIPTIONS:
+        value = plist.get(key)
+        if not isinstance(value, str) or not value.strip():
+            issues.append(PreflightIssue('ERROR', 'plist', f"{name} description missing: {key}", str(plist_path)))
+
+    return issues
+
+
+def run_preflight(project_root: Path) -> List[PreflightIssue]:
+    """Run all pre-flight checks"""
+    project_root = Path(project_root)
+    return check_app_icons(project_root) + check_info_plist(project_root)
+
+
+def main():
+    if sys.argv[1:2] in (['-h'], ['--help']):
+        print(__doc__.strip())
+        return
+    project_root = Path(sys.argv[1]) if len(sys.argv) > 1 else Path(__file__).parent
+
+    start = time.perf_counter()
+    issues = run_preflight(project_root)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    print("🛫 Odyseya iOS Pre-flight")
+    print("=" * 60)
+
+    for issue in issues:
+        icon = "❌" if issue.severity == 'ERROR' else "⚠️ "
+        print(f"{icon} [{issue.check}] {issue.message}")
+
+    errors = [i for i in issues if i.severity == 'ERROR']
+    if not issues:
+        print("✅ App icons and Info.plist look good")
+
+    print("=" * 60)
+    print(f"Errors: {len(errors)}  Warnings: {len(issues) - len(errors)}  ({elapsed_ms:.1f} ms)")
+
+    sys.exit(1 if errors else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,24 +1,37 @@
 #!/usr/bin/env python3
 """
 🏜️ Odyseya Unified Compliance Agent
-Validates both UX/Design and Architecture compliance
+Validates UX/Design, Architecture and runtime-performance compliance
 
-Usage: python3 odyseya_compliance_agent.py
+Usage: python3 odyseya_compliance_agent.py [--project-root DIR] [--report FILE | --no-report] [--json]
+         [--baseline FILE] [--update-baseline] [--history [DB]]
+         [--root DIR ...] [--include GLOB ...] [--exclude GLOB ...] [--workers N]
 """
 
 import os
 import re
 import sys
+import json
+import hashlib
+import argparse
+import contextlib
 from pathlib import Path
 from datetime import datetime
 from typing import List
 from collections import defaultdict
 
+from ios_preflight import read_png_header
+from source_scan import DEFAULT_EXCLUDES, DEFAULT_PATTERNS, default_workers, discover, run_pool
+
+# Same as compliance_history.DEFAULT_DB; that module (and sqlite3) is only imported with --history
+DEFAULT_HISTORY_DB = Path('reports') / 'compliance_history.sqlite'
+
 
 class ComplianceViolation:
     """Represents a compliance violation"""
 
-    def __init__(self, file_path: str, line: int, severity: str, category: str, vtype: str, message: str, fix: str = None):
+    def __init__(self, file_path: str, line: int, severity: str, category: str, vtype: str, message: str, fix: str = None,
+                 snippet: str = ''):
         self.file_path = file_path
         self.line = line
         self.severity = severity  # CRITICAL, HIGH, MEDIUM, LOW
@@ -26,10 +39,287 @@ class ComplianceViolation:
         self.vtype = vtype
         self.message = message
         self.fix = fix
+        self.snippet = snippet  # source line, used for baseline fingerprints
+
+    def to_dict(self) -> dict:
+        return {
+            'file': str(self.file_path),
+            'line': self.line,
+            'severity': self.severity,
+            'category': self.category,
+            'type': self.vtype,
+            'message': self.message,
+            'fix': self.fix,
+        }
+
+    def fingerprint(self, rel_path: str, occurrence: int = 0) -> str:
+        """Stable id: rule + normalized line content + file path hash (no line number)"""
+        path_hash = hashlib.sha1(rel_path.encode('utf-8')).hexdigest()[:12]
+        content = ' '.join(self.snippet.split())
+        key = f"{self.vtype}\0{content}\0{path_hash}\0{occurrence}"
+        return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+
+class AuditResult:
+    """Violations and file count of one audit() / audit_source() call"""
+
+    SEVERITIES = ('CRITICAL', 'HIGH', 'MEDIUM', 'LOW')
+
+    def __init__(self, violations: List[ComplianceViolation], files_checked: int, files: List[Path] = None):
+        self.violations = violations
+        self.files_checked = files_checked
+        self.files = files or []  # paths that were checked
+
+    def __iter__(self):
+        return iter(self.violations)
+
+    def __len__(self):
+        return len(self.violations)
+
+    def counts(self) -> dict:
+        """Violation count per severity"""
+        counts = {severity: 0 for severity in self.SEVERITIES}
+        for v in self.violations:
+            counts[v.severity] = counts.get(v.severity, 0) + 1
+        return counts
+
+    def to_dict(self) -> dict:
+        return {
+            'files_checked': self.files_checked,
+            'counts': self.counts(),
+            'violations': [v.to_dict() for v in self.violations],
+        }
+
+
+class Frame:
+    """An open bracket during a scan: the call it belongs to and any background it sets"""
+
+    def __init__(self, name: str, line: int, column: int):
+        self.name = name  # e.g. 'Container', 'AppTextStyles.body.copyWith'; None for { and [
+        self.line = line
+        self.column = column
+        self.background = None
+        self.const = False  # inside a const expression (this bracket or an enclosing one)
+
+    @property
+    def call(self) -> str:
+        return self.name.split('.')[-1] if self.name else None
+
+
+class Argument:
+    """A named argument (name: value) seen on a line, with the frames enclosing it"""
+
+    def __init__(self, name: str, value: str, frames: List[Frame]):
+        self.name = name
+        self.value = value
+        self.frames = frames
+
+
+class ScanContext:
+    """Tracks open calls, named arguments and enclosing regions (build(), item builders) during a file scan"""
+
+    REGION_MARKERS = [
+        ('build', re.compile(r'\bWidget\s+build\s*\(')),
+        ('item_builder', re.compile(r'\b(?:itemBuilder|separatorBuilder)\s*:')),
+    ]
+    CALL_NAME = re.compile(r'([A-Za-z_][\w.]*)\s*(?:<[^<>]*>)?\s*$')
+    CONST_PREFIX = re.compile(r'\bconst\s+(?:[A-Za-z_][\w.]*\s*)?(?:<[^<>]*>\s*)?$')
+    NAMED_ARGUMENT = re.compile(r'([A-Za-z_]\w*)\s*:(?!:)')
+
+    def __init__(self, lines: List[str]):
+        self.lines = lines
+        self.index = -1
+        self.frames: List[Frame] = []
+        self.arguments: List[Argument] = []
+        self.regions = []  # (kind, depth at which the region closes)
+        self.const_spans = []  # (start, end) columns of the current line inside a const expression
+
+    @property
+    def depth(self) -> int:
+        return len(self.frames)
+
+    @staticmethod
+    def bracket_delta(line: str) -> int:
+        """Net open brackets on a line, ignoring string literals and // comments"""
+        delta = 0
+        quote = None
+        i = 0
+        while i < len(line):
+            ch = line[i]
+            if quote:
+                if ch == '\\':
+                    i += 1
+                elif ch == quote:
+                    quote = None
+            elif ch in '\'"':
+                quote = ch
+            elif ch == '/' and line[i + 1:i + 2] == '/':
+                break
+            elif ch in '({[':
+                delta += 1
+            elif ch in ')}]':
+                delta -= 1
+            i += 1
+        return delta
+
+    @staticmethod
+    def argument_value(line: str, start: int) -> str:
+        """Text of an argument value up to the next top-level comma or closing bracket"""
+        depth = 0
+        quote = None
+        i = start
+        while i < len(line):
+            ch = line[i]
+            if quote:
+                if ch == quote:
+                    quote = None
+            elif ch in '\'"':
+                quote = ch
+            elif ch in '({[':
+                depth += 1
+            elif ch in ')}]':
+                if depth == 0:
+                    break
+                depth -= 1
+            elif ch == ',' and depth == 0:
+                break
+            elif ch == '/' and line[i + 1:i + 2] == '/':
+                break
+            i += 1
+        return line[start:i].strip()
+
+    def continuation(self, index: int, max_lines: int = 3) -> str:
+        """Chained calls (.withValues(...)) wrapped onto the lines after an argument value"""
+        text = ''
+        for next_line in self.lines[index:index + max_lines]:
+            if not next_line.lstrip().startswith('.'):
+                break
+            text += self.argument_value(next_line, len(next_line) - len(next_line.lstrip()))
+        return text
+
+    def enter_line(self, line: str):
+        self.index += 1
+        self.arguments = []
+        for kind, marker in self.REGION_MARKERS:
+            if marker.search(line):
+                self.regions.append((kind, self.depth))
+
+        self.const_spans = []
+        const_start = 0 if self.in_const_frame() else None
+
+        quote = None
+        i = 0
+        while i < len(line):
+            ch = line[i]
+            if quote:
+                if ch == '\\':
+                    i += 1
+                elif ch == quote:
+                    quote = None
+            elif ch in '\'"':
+                quote = ch
+            elif ch == '/' and line[i + 1:i + 2] == '/':
+                break
+            elif ch in '({[':
+                name = self.CALL_NAME.search(line[:i]) if ch == '(' else None
+                frame = Frame(name.group(1) if name else None, self.index, i)
+                frame.const = self.in_const_frame() or bool(self.CONST_PREFIX.search(line[:i]))
+                self.frames.append(frame)
+                if frame.const and const_start is None:
+                    const_start = i
+            elif ch in ')}]':
+                if self.frames:
+                    self.frames.pop()
+                if const_start is not None and not self.in_const_frame():
+                    self.const_spans.append((const_start, i + 1))
+                    const_start = None
+            elif (ch.isalpha() or ch == '_') and (i == 0 or not (line[i - 1].isalnum() or line[i - 1] in '_.')):
+                match = self.NAMED_ARGUMENT.match(line, i)
+                if match:
+                    value = self.argument_value(line, match.end())
+                    if line.rstrip().endswith(value):
+                        value += self.continuation(self.index + 1)
+                    self.arguments.append(Argument(match.group(1), value, list(self.frames)))
+                    i = match.end()
+                    continue
+            i += 1
+
+        if const_start is not None:
+            self.const_spans.append((const_start, len(line)))
+
+    def in_const_frame(self) -> bool:
+        return bool(self.frames) and self.frames[-1].const
+
+    def in_const(self, column: int) -> bool:
+        """Whether a column of the current line sits inside a const expression"""
+        return any(start <= column < end for start, end in self.const_spans)
+
+    def exit_line(self):
+        # A region ends once depth is back where it started
+        self.regions = [(kind, depth) for kind, depth in self.regions if self.depth > depth]
+
+    def in_region(self, kind: str) -> bool:
+        return any(region == kind for region, _ in self.regions)
+
+    def expression_from(self, column: int, max_lines: int = 15, line_index: int = None) -> str:
+        """Text of the call starting at column on a line (default: current), up to its closing paren"""
+        index = self.index if line_index is None else line_index
+        text = self.lines[index][column:]
+        depth = self.bracket_delta(text)
+        j = index + 1
+        while depth > 0 and j < len(self.lines) and j <= index + max_lines:
+            text += self.lines[j]
+            depth += self.bracket_delta(self.lines[j])
+            j += 1
+        return text[:self.closing_index(text)]
+
+    @staticmethod
+    def closing_index(text: str) -> int:
+        """Index just past the bracket that closes the first one opened in text (len(text) if none)"""
+        depth = 0
+        quote = None
+        i = 0
+        while i < len(text):
+            ch = text[i]
+            if quote:
+                if ch == '\\':
+                    i += 1
+                elif ch == quote:
+                    quote = None
+            elif ch in '\'"':
+                quote = ch
+            elif ch == '/' and text[i + 1:i + 2] == '/':
+                newline = text.find('\n', i)
+                if newline < 0:
+                    break
+                i = newline
+                continue
+            elif ch in '({[':
+                depth += 1
+            elif ch in ')}]':
+                depth -= 1
+                if depth <= 0:
+                    return i + 1
+            i += 1
+        return len(text)
+
+    def call_text(self, frame: Frame, max_lines: int = 30) -> str:
+        """Full argument text of an open call"""
+        return self.expression_from(frame.column, max_lines, frame.line)
 
 
 class OdyseyaComplianceAgent:
-    """Unified compliance agent for Odyseya"""
+    """Unified compliance agent for Odyseya
+
+    Rules and the palette contrast table are built once per instance, so a
+    long-lived instance can be reused for many audits:
+
+        auditor = OdyseyaComplianceAgent('/path/to/project')
+        result = auditor.audit(['lib'])           # AuditResult
+        result = auditor.audit_source(text, 'lib/screens/home.dart')
+    """
+
+    SKIPPED_FILES = ('.g.dart', '.freezed.dart', 'firebase_options.dart')
 
     # Approved color palette
     APPROVED_COLORS = {
@@ -37,104 +327,473 @@ class OdyseyaComplianceAgent:
         '0xFFC6D9ED', '0xFFAAC6E5', '0xFFF9F5F0', '0xFFFFFFFF',
     }
 
+    BASELINE_VERSION = 1
+
+    # Text contrast (WCAG 2.1 AA)
+    CONTRAST_AA = 4.5
+    CONTRAST_MINIMUM = 3.0
+    PALETTE_FILE = Path('lib/constants/colors.dart')
+    DEFAULT_BACKGROUND = 'DesertColors.backgroundSand'
+    FLUTTER_COLORS = {
+        'Colors.white': 0xFFFFFFFF,
+        'Colors.white70': 0xB3FFFFFF,
+        'Colors.white54': 0x8AFFFFFF,
+        'Colors.black': 0xFF000000,
+        'Colors.black87': 0xDD000000,
+        'Colors.black54': 0x8A000000,
+        'Colors.transparent': 0x00000000,
+    }
+    TEXT_STYLE_CALLS = {'TextStyle', 'copyWith'}
+    BUTTON_STYLE_CALLS = {'styleFrom', 'ButtonStyle'}
+    DECORATION_CALLS = {'BoxDecoration', 'ShapeDecoration'}
+    COLOR_TOKEN = re.compile(r'^(?:const\s+)?(Color\((0x[0-9A-Fa-f]{8})\)|[A-Za-z_][\w.]*?)'
+                             r'(?:\.with(?:Values\(alpha:|Opacity\()\s*([\d.]+)\s*\))?$')
+
+    # Performance rules
+    LARGE_IMAGE_DIMENSION = 512
+    CONST_CANDIDATE = re.compile(
+        r'(?<![\w.])(SizedBox|Spacer|Divider|EdgeInsets\.(?:all|symmetric|only|fromLTRB))'
+        r'\((\s*(?:\w+:\s*)?-?\d+(?:\.\d+)?\s*(?:,\s*(?:\w+:\s*)?-?\d+(?:\.\d+)?\s*)*,?\s*)?\)'
+    )
+    SAVE_LAYER_WIDGETS = re.compile(r'(?<![\w.])(Opacity|ShaderMask|BackdropFilter|ColorFiltered)\(')
+    SYNC_IO_CALLS = re.compile(r'\.(\w+Sync)\(')
+    IMAGE_ASSET = re.compile(r'Image\.asset\(\s*[\'"]([^\'"]+)[\'"]')
+    IMAGE_ASSET_CALL = re.compile(r'Image\.asset\(')
+
+    # Design rules
+    COLOR_LITERAL = re.compile(r'Color\((0x[0-9A-Fa-f]{8})\)')
+    BACKGROUND_ARGUMENT = re.compile(r'backgroundColor:\s*([^,\n]+)')
+    BORDER_RADIUS = re.compile(r'BorderRadius\.circular\((\d+)\)')
+    ANIMATION_DURATION = re.compile(r'Duration\(milliseconds:\s*(\d+)\)')
+
     def __init__(self, project_root: str):
         self.project_root = Path(project_root)
         self.violations: List[ComplianceViolation] = []
         self.files_checked = 0
-
-    def check_file(self, file_path: Path):
-        """Check a single file"""
+        self.checked_files: List[Path] = []
+        self.baseline_path: Path = None
+        self.baselined_count = 0
+        self._asset_dimensions = {}
+
+        # Palette and contrast table are built once per agent
+        self.palette = self.load_palette()
+        self.contrast_table = self.build_contrast_table(set(self.palette.values()))
+        self._best_text_color = {}
+
+    def audit(self, paths=None, patterns=DEFAULT_PATTERNS, exclude=DEFAULT_EXCLUDES,
+              workers: int = 1) -> AuditResult:
+        """Audit files and directories (relative to the project root; default: lib)
+
+        workers=1 runs in this instance; more workers use a process pool.
+        workers=None picks a count from the number of files (1 for small trees).
+        """
+        files = discover([self.project_root / path for path in (paths or ['lib'])], patterns, exclude)
+
+        if (workers or default_workers(len(files))) == 1:
+            results = (self._check_path(file_path) for file_path in files)
+        else:
+            results = run_pool(_check_file_worker, files, workers, _init_worker, (str(self.project_root),))
+
+        violations = []
+        checked_files = []
+        for file_path, (checked, file_violations) in zip(files, results):
+            if checked:
+                checked_files.append(file_path)
+            violations.extend(file_violations)
+
+        # Workers finish in any order; keep reports and baselines stable
+        violations.sort(key=lambda v: (v.file_path, v.line))
+        return AuditResult(violations, len(checked_files), checked_files)
+
+    def audit_source(self, text: str, path='lib/untitled.dart') -> AuditResult:
+        """Audit in-memory Dart source as if it were the file at path"""
+        file_path = Path(path)
+        if not file_path.is_absolute():
+            file_path = self.project_root / file_path
+        return AuditResult(self._check_lines(file_path, text.splitlines(keepends=True)), 1, [file_path])
+
+    def _check_path(self, file_path: Path):
+        """Check one file on disk; returns (files checked, violations)"""
         if not file_path.suffix == '.dart':
-            return
-
-        if any(skip in str(file_path) for skip in ['.g.dart', '.freezed.dart', 'firebase_options.dart']):
-            return
+            return 0, []
 
-        self.files_checked += 1
+        if any(skip in str(file_path) for skip in self.SKIPPED_FILES):
+            return 0, []
 
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
                 lines = f.readlines()
         except Exception as e:
-            return
+            return 1, []
 
-        # Run checks
-        self.check_colors(file_path, lines)
-        self.check_corner_radius(file_path, lines)
-        self.check_animations(file_path, lines)
+        return 1, self._check_lines(file_path, lines)
 
-    def check_colors(self, file_path: Path, lines: List[str]):
+    def _check_lines(self, file_path: Path, lines: List[str]) -> List[ComplianceViolation]:
+        """Run every rule over lines and return the violations found"""
+        # Rules append to self.violations; collect this file's into a fresh list
+        collected, self.violations = self.violations, []
+        try:
+            self._run_rules(file_path, lines)
+            return self.violations
+        finally:
+            self.violations = collected
+
+    def check_file(self, file_path: Path):
+        """Check a single file"""
+        checked, violations = self._check_path(file_path)
+        self.files_checked += checked
+        self.violations.extend(violations)
+
+    def _run_rules(self, file_path: Path, lines: List[str]):
+        # Run checks: one pass over the lines, every rule sees each line once
+        check_colors = self.checks_colors(file_path)
+        context = ScanContext(lines)
+        for i, line in enumerate(lines, 1):
+            context.enter_line(line)
+            self.check_line(file_path, i, line, context, check_colors)
+            context.exit_line()
+
+    @staticmethod
+    def checks_colors(file_path: Path) -> bool:
+        # The palette and typography definitions are allowed raw colors
+        return 'constants/' not in str(file_path)
+
+    def check_line(self, file_path: Path, i: int, line: str, context: 'ScanContext', check_colors: bool = True):
+        """Run every rule on one line; context must already have entered it"""
+        if check_colors:
+            self.check_colors(file_path, i, line)
+            self.check_contrast(file_path, i, line, context)
+        self.check_corner_radius(file_path, i, line)
+        self.check_animations(file_path, i, line)
+        self.check_performance(file_path, i, line, context)
+
+    def check_colors(self, file_path: Path, i: int, line: str):
         """Check color compliance"""
-        if 'constants/' in str(file_path):
+        if line.strip().startswith('//'):
             return
 
-        for i, line in enumerate(lines, 1):
-            if line.strip().startswith('//'):
+        # Check Color() constructors
+        color_matches = self.COLOR_LITERAL.findall(line)
+        for color in color_matches:
+            if color.upper() not in self.APPROVED_COLORS:
+                self.violations.append(ComplianceViolation(
+                    str(file_path), i, 'CRITICAL', 'UX', 'non-compliant-color',
+                    f"Non-approved color: {color}",
+                    "Use DesertColors constant",
+                    line
+                ))
+
+    def load_palette(self) -> dict:
+        """Map color tokens (hex literals, Colors.*, DesertColors.*) to ARGB values"""
+        palette = {color: int(color, 16) for color in self.APPROVED_COLORS}
+        palette.update(self.FLUTTER_COLORS)
+
+        palette_path = self.project_root / self.PALETTE_FILE
+        if not palette_path.exists():
+            return palette
+
+        aliases = {}
+        class_name = None
+        with open(palette_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                class_match = re.match(r'\s*class\s+(\w+)', line)
+                if class_match:
+                    class_name = class_match.group(1)
+                    continue
+                match = re.match(r'\s*static const Color (\w+)\s*=\s*([^;]+);', line)
+                if not match or not class_name:
+                    continue
+                name, value = f"{class_name}.{match.group(1)}", match.group(2).strip()
+                literal = re.match(r'Color\((0x[0-9A-Fa-f]{8})\)$', value)
+                if literal:
+                    palette[name] = int(literal.group(1), 16)
+                else:
+                    # Same-class alias (cardWhite) or qualified (Colors.black)
+                    aliases[name] = value if '.' in value else f"{class_name}.{value}"
+
+        for _ in range(len(aliases)):
+            unresolved = {name: target for name, target in aliases.items() if target not in palette}
+            for name, target in aliases.items():
+                if target in palette:
+                    palette[name] = palette[target]
+            if not unresolved:
+                break
+            aliases = unresolved
+        return palette
+
+    @staticmethod
+    def relative_luminance(argb: int) -> float:
+        channels = []
+        for shift in (16, 8, 0):
+            c = ((argb >> shift) & 0xFF) / 255
+            channels.append(c / 12.92 if c <= 0.03928 else ((c + 0.055) / 1.055) ** 2.4)
+        r, g, b = channels
+        return 0.2126 * r + 0.7152 * g + 0.0722 * b
+
+    @staticmethod
+    def blend(fg: int, bg: int) -> int:
+        """Composite fg over bg (both ARGB); translucent backgrounds sit on white"""
+        if (bg >> 24) & 0xFF != 0xFF:
+            bg = OdyseyaComplianceAgent.blend(bg, 0xFFFFFFFF)
+        alpha = ((fg >> 24) & 0xFF) / 255
+        out = 0xFF000000
+        for shift in (16, 8, 0):
+            f, b = (fg >> shift) & 0xFF, (bg >> shift) & 0xFF
+            out |= round(f * alpha + b * (1 - alpha)) << shift
+        return out
+
+    @classmethod
+    def contrast_ratio(cls, fg: int, bg: int) -> float:
+        bg = cls.blend(bg, 0xFFFFFFFF) if (bg >> 24) & 0xFF != 0xFF else bg
+        lighter, darker = sorted((cls.relative_luminance(cls.blend(fg, bg)), cls.relative_luminance(bg)), reverse=True)
+        return (lighter + 0.05) / (darker + 0.05)
+
+    def build_contrast_table(self, colors: set) -> dict:
+        """Precompute contrast ratios for every (foreground, background) palette pair"""
+        return {(fg, bg): self.contrast_ratio(fg, bg) for fg in colors for bg in colors}
+
+    def lookup_contrast(self, fg: int, bg: int) -> float:
+        key = (fg, bg)
+        if key not in self.contrast_table:
+            # Off-palette pair (e.g. alpha applied): compute once, then O(1)
+            self.contrast_table[key] = self.contrast_ratio(fg, bg)
+        return self.contrast_table[key]
+
+    def resolve_color(self, token: str):
+        """ARGB value of a color expression, or None when it cannot be resolved statically"""
+        match = self.COLOR_TOKEN.match(token.strip()) if token else None
+        if not match:
+            return None
+        argb = int(match.group(2), 16) if match.group(2) else self.palette.get(match.group(1))
+        if argb is None:
+            return None
+        if match.group(3):
+            alpha = round(min(1.0, float(match.group(3))) * ((argb >> 24) & 0xFF))
+            argb = (alpha << 24) | (argb & 0xFFFFFF)
+        return argb
+
+    def best_text_color(self, bg: int) -> str:
+        """Approved DesertColors entry with the highest contrast on bg"""
+        if bg not in self._best_text_color:
+            named = [(name, argb) for name, argb in self.palette.items()
+                     if name.startswith('DesertColors.') and f"0x{argb:08X}" in self.APPROVED_COLORS]
+            name, argb = max(named, key=lambda item: self.lookup_contrast(item[1], bg), default=('', 0))
+            self._best_text_color[bg] = f"{name} (#{argb & 0xFFFFFF:06X})"
+        return self._best_text_color[bg]
+
+    def check_contrast(self, file_path: Path, i: int, line: str, context: 'ScanContext'):
+        """Check WCAG contrast of text colors against their resolved background"""
+        for arg in context.arguments:
+            if not arg.frames or arg.name not in ('color', 'backgroundColor', 'foregroundColor', 'gradient', 'image'):
                 continue
+            inner = arg.frames[-1]
+            outer = arg.frames[-2] if len(arg.frames) > 1 else inner
 
-            # Check Color() constructors
-            color_matches = re.findall(r'Color\((0x[0-9A-Fa-f]{8})\)', line)
-            for color in color_matches:
-                if color.upper() not in self.APPROVED_COLORS:
-                    self.violations.append(ComplianceViolation(
-                        str(file_path), i, 'CRITICAL', 'UX', 'non-compliant-color',
-                        f"Non-approved color: {color}",
-                        "Use DesertColors constant"
-                    ))
+            # Gradients and images: the text color cannot be checked against a single color
+            if arg.name in ('gradient', 'image'):
+                if inner.call in self.DECORATION_CALLS:
+                    outer.background = f"<{arg.name}>"
+                continue
 
-            # Check white text
-            if 'Colors.white' in line and any(kw in line.lower() for kw in ['text', 'color:']):
-                if 'background' not in line.lower():
-                    self.violations.append(ComplianceViolation(
-                        str(file_path), i, 'CRITICAL', 'UX', 'white-text',
-                        "White text on light background",
-                        "Use DesertColors.brownBramble (#57351E)"
-                    ))
+            # Record backgrounds on the widget that paints them
+            if arg.name == 'backgroundColor' or (arg.name == 'color' and inner.call in self.DECORATION_CALLS):
+                owner = outer if inner.call in self.BUTTON_STYLE_CALLS | self.DECORATION_CALLS else inner
+                bg = self.resolve_color(arg.value)
+                if bg is not None and (bg >> 24) & 0xFF and not (owner.background or '').startswith('<'):
+                    owner.background = arg.value
+                continue
 
-    def check_corner_radius(self, file_path: Path, lines: List[str]):
-        """Check corner radius"""
-        for i, line in enumerate(lines, 1):
-            radius_matches = re.findall(r'BorderRadius\.circular\((\d+)\)', line)
-            for radius in radius_matches:
-                radius_val = int(radius)
-                if 'button' in line.lower() and radius_val != 16:
-                    self.violations.append(ComplianceViolation(
-                        str(file_path), i, 'HIGH', 'UX', 'wrong-button-radius',
-                        f"Button radius should be 16px, not {radius}px",
-                        "BorderRadius.circular(16)"
-                    ))
+            if arg.name == 'color' and inner.call in self.TEXT_STYLE_CALLS:
+                bg_token = next((f.background for f in reversed(arg.frames) if f.background), None)
+            elif arg.name == 'foregroundColor' and inner.call in self.BUTTON_STYLE_CALLS:
+                bg_match = self.BACKGROUND_ARGUMENT.search(context.call_text(inner))
+                bg_token = bg_match.group(1).strip().rstrip(')') if bg_match else None
+                if bg_token is None:
+                    continue
+            else:
+                continue
 
-    def check_animations(self, file_path: Path, lines: List[str]):
-        """Check animation durations"""
-        for i, line in enumerate(lines, 1):
-            duration_matches = re.findall(r'Duration\(milliseconds:\s*(\d+)\)', line)
-            for duration in duration_matches:
-                duration_val = int(duration)
-                if duration_val < 200 or duration_val > 300:
-                    severity = 'HIGH' if duration_val > 500 else 'MEDIUM'
-                    self.violations.append(ComplianceViolation(
-                        str(file_path), i, severity, 'UX', 'wrong-animation',
-                        f"Animation should be 200-300ms, not {duration}ms",
-                        "Duration(milliseconds: 250)"
-                    ))
+            if bg_token and bg_token.startswith('<'):
+                continue  # over a gradient or image
+
+            fg = self.resolve_color(arg.value)
+            assumed = bg_token is None
+            bg = self.resolve_color(bg_token or self.DEFAULT_BACKGROUND)
+            if fg is None or bg is None:
+                continue
+
+            ratio = self.lookup_contrast(fg, bg)
+            if ratio >= self.CONTRAST_AA:
+                continue
 
-    def scan_directory(self):
-        """Scan lib directory"""
-        lib_path = self.project_root / 'lib'
-        if not lib_path.exists():
+            if assumed:
+                # No background in this file (parent widget, Stack over an image...): only a hint
+                severity = 'LOW'
+                background = f"{self.DEFAULT_BACKGROUND} (assumed, no background found)"
+            else:
+                severity = 'CRITICAL' if ratio < self.CONTRAST_MINIMUM else 'HIGH'
+                background = bg_token
+            self.violations.append(ComplianceViolation(
+                str(file_path), i, severity, 'UX', 'low-contrast-text',
+                f"{arg.value} on {background}: contrast {ratio:.2f}:1 (WCAG AA needs {self.CONTRAST_AA}:1)",
+                f"Use {self.best_text_color(bg)}",
+                line
+            ))
+
+    def check_corner_radius(self, file_path: Path, i: int, line: str):
+        """Check corner radius"""
+        radius_matches = self.BORDER_RADIUS.findall(line)
+        for radius in radius_matches:
+            radius_val = int(radius)
+            if 'button' in line.lower() and radius_val != 16:
+                self.violations.append(ComplianceViolation(
+                    str(file_path), i, 'HIGH', 'UX', 'wrong-button-radius',
+                    f"Button radius should be 16px, not {radius}px",
+                    "BorderRadius.circular(16)",
+                    line
+                ))
+
+    def check_animations(self, file_path: Path, i: int, line: str):
+        """Check animation durations"""
+        duration_matches = self.ANIMATION_DURATION.findall(line)
+        for duration in duration_matches:
+            duration_val = int(duration)
+            if duration_val < 200 or duration_val > 300:
+                severity = 'HIGH' if duration_val > 500 else 'MEDIUM'
+                self.violations.append(ComplianceViolation(
+                    str(file_path), i, severity, 'UX', 'wrong-animation',
+                    f"Animation should be 200-300ms, not {duration}ms",
+                    "Duration(milliseconds: 250)",
+                    line
+                ))
+
+    def check_performance(self, file_path: Path, i: int, line: str, context: 'ScanContext'):
+        """Check runtime-performance anti-patterns"""
+        if line.strip().startswith('//'):
             return
+        code = line
 
-        for file_path in lib_path.rglob('*.dart'):
-            self.check_file(file_path)
+        # Constructors with literal-only arguments that could be const
+        for match in self.CONST_CANDIDATE.finditer(code):
+            # Already const itself, or inside a const parent (possibly opened on an earlier line)
+            if context.in_const(match.start()) or ScanContext.CONST_PREFIX.search(code[:match.start()]):
+                continue
+            self.violations.append(ComplianceViolation(
+                str(file_path), i, 'LOW', 'PERFORMANCE', 'missing-const',
+                f"{match.group(1)}(...) could be const",
+                f"const {match.group(0).strip()}",
+                line
+            ))
+
+        if context.in_region('item_builder'):
+            # saveLayer-backed widgets repaint offscreen for every visible item
+            for widget in self.SAVE_LAYER_WIDGETS.findall(code):
+                self.violations.append(ComplianceViolation(
+                    str(file_path), i, 'MEDIUM', 'PERFORMANCE', 'save-layer-in-list',
+                    f"{widget} inside a list item builder triggers saveLayer per item",
+                    "Bake opacity into the color (withValues(alpha: ...)) or use FadeTransition",
+                    line
+                ))
+
+            if 'MediaQuery.of(' in code:
+                self.violations.append(ComplianceViolation(
+                    str(file_path), i, 'MEDIUM', 'PERFORMANCE', 'mediaquery-in-builder',
+                    "MediaQuery.of inside an item builder rebuilds every item on any metrics change",
+                    "Read MediaQuery.sizeOf(context) once outside the builder",
+                    line
+                ))
+
+        if context.in_region('build'):
+            for call in self.SYNC_IO_CALLS.findall(code):
+                self.violations.append(ComplianceViolation(
+                    str(file_path), i, 'HIGH', 'PERFORMANCE', 'sync-io-in-build',
+                    f"Synchronous I/O ({call}) in build() blocks the UI thread",
+                    "Load data in initState/FutureBuilder with the async API",
+                    line
+                ))
+
+        for image in self.IMAGE_ASSET_CALL.finditer(code):
+            expression = context.expression_from(image.start())
+            if 'cacheWidth' not in expression and 'cacheHeight' not in expression:
+                asset = self.IMAGE_ASSET.search(expression)
+                dims = self.asset_dimensions(asset.group(1)) if asset else None
+                if dims and max(dims) > self.LARGE_IMAGE_DIMENSION:
+                    self.violations.append(ComplianceViolation(
+                        str(file_path), i, 'MEDIUM', 'PERFORMANCE', 'image-without-cache-size',
+                        f"Image.asset decodes {asset.group(1)} at full {dims[0]}x{dims[1]}px",
+                        "Pass cacheWidth/cacheHeight or use OptimizedImage",
+                        line
+                    ))
 
-    def run_audit(self):
+    def asset_dimensions(self, asset_path: str):
+        """Return (width, height) of a PNG asset from its header, cached per run"""
+        if asset_path not in self._asset_dimensions:
+            header = read_png_header(self.project_root / asset_path)
+            self._asset_dimensions[asset_path] = header[:2] if header else None
+        return self._asset_dimensions[asset_path]
+
+    def scan_directory(self, roots=None, patterns=DEFAULT_PATTERNS, exclude=DEFAULT_EXCLUDES, workers: int = None):
+        """Scan source roots (default: lib) on one shared worker pool, largest files first"""
+        result = self.audit(roots, patterns, exclude, workers)
+        self.files_checked += result.files_checked
+        self.checked_files.extend(result.files)
+        self.violations.extend(result.violations)
+
+    def fingerprints(self) -> List[tuple]:
+        """Return (fingerprint, violation) pairs; repeats of the same content are numbered"""
+        seen = defaultdict(int)
+        result = []
+        for v in self.violations:
+            try:
+                rel_path = Path(v.file_path).relative_to(self.project_root).as_posix()
+            except ValueError:
+                rel_path = Path(v.file_path).as_posix()
+            content = ' '.join(v.snippet.split())
+            key = (v.vtype, content, rel_path)
+            result.append((v.fingerprint(rel_path, seen[key]), v))
+            seen[key] += 1
+        return result
+
+    def load_baseline(self, baseline_path: Path) -> set:
+        """Load baseline fingerprints into a set"""
+        if not baseline_path.exists():
+            return set()
+        with open(baseline_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return set(data.get('fingerprints', []))
+
+    def apply_baseline(self, baseline_path: Path):
+        """Keep only violations whose fingerprint is not in the baseline"""
+        self.baseline_path = baseline_path
+        known = self.load_baseline(baseline_path)
+        new = [v for fp, v in self.fingerprints() if fp not in known]
+        self.baselined_count = len(self.violations) - len(new)
+        self.violations = new
+
+    def save_baseline(self, baseline_path: Path):
+        """Write all current fingerprints as the new baseline"""
+        data = {
+            'version': self.BASELINE_VERSION,
+            'generated': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'fingerprints': sorted(fp for fp, _ in self.fingerprints()),
+        }
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = baseline_path.with_name(baseline_path.name + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+            f.write('\n')
+        os.replace(tmp_path, baseline_path)
+
+        print(f"📌 Baseline updated: {baseline_path} ({len(data['fingerprints'])} violations)\n")
+
+    def run_audit(self, roots=None, patterns=DEFAULT_PATTERNS, exclude=DEFAULT_EXCLUDES, workers: int = None):
         """Run complete audit"""
         print("🏜️ Odyseya Compliance Agent")
         print("=" * 60)
-        print("Checking: UX (Design) + Architecture (Code)")
+        print("Checking: UX (Design) + Architecture (Code) + Performance")
         print("=" * 60)
 
-        self.scan_directory()
+        self.scan_directory(roots, patterns, exclude, workers)
 
         print(f"\n✅ Audit complete")
         print(f"   Files checked: {self.files_checked}")
@@ -147,9 +806,14 @@ class OdyseyaComplianceAgent:
             f"\n**Generated**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
             f"**Files Checked**: {self.files_checked}",
             f"**Total Violations**: {len(self.violations)}\n",
-            "---\n",
         ]
 
+        if self.baseline_path:
+            lines[-1] = f"**New Violations**: {len(self.violations)}"
+            lines.append(f"**Baselined**: {self.baselined_count} (`{self.baseline_path.name}`)\n")
+
+        lines.append("---\n")
+
         if not self.violations:
             lines.append("## ✅ No violations found!\n")
             return '\n'.join(lines)
@@ -201,7 +865,10 @@ class OdyseyaComplianceAgent:
         print("=" * 60)
         print("📊 SUMMARY")
         print("=" * 60)
-        print(f"Total Violations: {len(self.violations)}")
+        if self.baseline_path:
+            print(f"New Violations: {len(self.violations)} ({self.baselined_count} baselined)")
+        else:
+            print(f"Total Violations: {len(self.violations)}")
         print(f"  🔴 Critical: {critical}")
         print(f"  🟠 High: {high}")
         print(f"  🟡 Medium: {medium}")
@@ -209,18 +876,117 @@ class OdyseyaComplianceAgent:
         print("=" * 60)
 
 
-def main():
-    project_root = Path(__file__).parent
+# Per-process agent for the shared scan pool (palette and caches built once per worker)
+_worker_agent = None
+
+
+def _init_worker(project_root: str):
+    global _worker_agent
+    _worker_agent = OdyseyaComplianceAgent(project_root)
+
+
+def _check_file_worker(file_path: Path):
+    """Check one file in a pool worker; returns (files checked, violations)"""
+    return _worker_agent._check_path(file_path)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Odyseya compliance agent")
+    parser.add_argument(
+        '--project-root',
+        type=Path,
+        default=Path(__file__).parent,
+        help="Flutter project to audit (default: this script's directory)"
+    )
+    parser.add_argument(
+        '--report',
+        type=Path,
+        help="Markdown report path (default: reports/Odyseya_Compliance_Report.md in the project)"
+    )
+    parser.add_argument('--no-report', action='store_true', help="Do not write the Markdown report")
+    parser.add_argument(
+        '--json',
+        action='store_true',
+        help="Print violations as JSON on stdout instead of the summary"
+    )
+    parser.add_argument(
+        '--baseline',
+        type=Path,
+        help="Baseline file of known violation fingerprints; only new violations are reported"
+    )
+    parser.add_argument(
+        '--update-baseline',
+        action='store_true',
+        help="Write all current violations to the baseline file"
+    )
+    parser.add_argument(
+        '--root',
+        action='append',
+        dest='roots',
+        metavar='DIR',
+        help="Source root to scan, relative to the project (repeatable, default: lib)"
+    )
+    parser.add_argument(
+        '--include',
+        action='append',
+        metavar='GLOB',
+        help=f"File glob relative to each root (repeatable, default: {' '.join(DEFAULT_PATTERNS)})"
+    )
+    parser.add_argument(
+        '--exclude',
+        action='append',
+        metavar='GLOB',
+        help=f"Glob of files to skip (repeatable, default: {' '.join(DEFAULT_EXCLUDES)})"
+    )
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Worker processes (default: 1 per 250 files, up to the CPU count)")
+    parser.add_argument(
+        '--history',
+        nargs='?',
+        type=Path,
+        const=DEFAULT_HISTORY_DB,
+        metavar='DB',
+        help=f"Record this audit in the SQLite history (default: {DEFAULT_HISTORY_DB})"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    project_root = args.project_root.resolve()
     agent = OdyseyaComplianceAgent(project_root)
 
-    agent.run_audit()
+    # With --json, stdout carries only the JSON document
+    with contextlib.redirect_stdout(sys.stderr) if args.json else contextlib.nullcontext():
+        agent.run_audit(args.roots, args.include or DEFAULT_PATTERNS, args.exclude or DEFAULT_EXCLUDES, args.workers)
+
+        # History keeps the full picture, before baselined violations are dropped
+        if args.history:
+            from compliance_history import ComplianceHistory, current_commit  # sqlite3 only when recording
+            history_path = args.history if args.history.is_absolute() else project_root / args.history
+            with ComplianceHistory(history_path) as history:
+                run_id = history.record(project_root, agent.checked_files, agent.violations,
+                                        current_commit(project_root))
+            print(f"🗂️  History: run {run_id} recorded in {history_path}\n")
+
+        if args.baseline or args.update_baseline:
+            baseline_path = args.baseline or project_root / 'reports' / 'compliance_baseline.json'
+            if not baseline_path.is_absolute():
+                baseline_path = Path.cwd() / baseline_path
+            if args.update_baseline:
+                agent.save_baseline(baseline_path)
+            agent.apply_baseline(baseline_path)
+
+        if not args.no_report:
+            agent.save_report(args.report or project_root / 'reports' / 'Odyseya_Compliance_Report.md')
 
-    output_path = project_root / 'reports' / 'Odyseya_Compliance_Report.md'
-    agent.save_report(output_path)
-    agent.print_summary()
+    if args.json:
+        print(json.dumps(AuditResult(agent.violations, agent.files_checked).to_dict(), indent=2))
+    else:
+        agent.print_summary()
 
-    sys.exit(0 if len(agent.violations) == 0 else 1)
+    return 0 if len(agent.violations) == 0 else 1
 
 
 if __name__ == '__main__':
-    main()
+    sys.exit(main())
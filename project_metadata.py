@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Odyseya Project Metadata
+Reads pubspec.yaml and pubspec.lock once and exposes the app version,
+build number and locked package versions. Version bumps rewrite only the
+`version:` line, so comments and formatting in pubspec.yaml survive.
+
+Usage:
+  python3 project_metadata.py version
+  python3 project_metadata.py bump [major|minor|patch|build]
+  python3 project_metadata.py set 1.2.0+7
+"""
+
+import os
+import re
+import sys
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+try:
+    import yaml
+except ImportError:  # PyYAML is optional; top-level keys are read line by line instead
+    yaml = None
+
+
+VERSION_LINE = re.compile(r'^(version:[ \t]*)(["\']?)([^"\'#\s]+)\2([ \t]*(?:#.*)?)$', re.MULTILINE)
+VERSION_PATTERN = re.compile(r'^(\d+)\.(\d+)\.(\d+)(?:\+(\d+))?$')
+
+BUMP_PARTS = ('major', 'minor', 'patch', 'build')
+
+# (path, mtime_ns, size) -> parsed file, so repeated lookups skip re-parsing
+_cache: Dict[Tuple[str, int, int], object] = {}
+
+
+def _load_yaml(text: str) -> Dict:
+    """Parse YAML, or read top-level scalar keys when PyYAML is missing"""
+    if yaml is not None:
+        return yaml.safe_load(text) or {}
+
+    data = {}
+    for line in text.splitlines():
+        match = re.match(r'^([A-Za-z_][\w-]*):[ \t]*(.*?)[ \t]*(?:#.*)?$', line)
+        if match and match.group(2):
+            data[match.group(1)] = match.group(2).strip('"\'')
+    return data
+
+
+def _load_lock_packages(text: str) -> Dict[str, str]:
+    """Return {package: version} from pubspec.lock"""
+    if yaml is not None:
+        packages = (yaml.safe_load(text) or {}).get('packages') or {}
+        return {name: str(info.get('version')) for name, info in packages.items()}
+
+    packages = {}
+    current = None
+    for line in text.splitlines():
+        package = re.match(r'^  ([\w-]+):\s*$', line)
+        if package:
+            current = package.group(1)
+            continue
+        version = re.match(r'^    version:\s*"?([^"\s]+)"?', line)
+        if current and version:
+            packages[current] = version.group(1)
+    return packages
+
+
+def _cached(path: Path, loader):
+    """Load a file through the stat-keyed parse cache"""
+    stat = path.stat()
+    key = (str(path.resolve()), stat.st_mtime_ns, stat.st_size)
+    if key not in _cache:
+        _cache[key] = loader(path.read_text(encoding='utf-8'))
+    return _cache[key]
+
+
+def parse_version(version_string: str) -> Tuple[str, Optional[str]]:
+    """Split '1.2.3+4' into ('1.2.3', '4')"""
+    version, _, build = str(version_string).partition('+')
+    return version, (build or None)
+
+
+class Pubspec:
+    """Parsed pubspec.yaml with version helpers"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.text = self.path.read_text(encoding='utf-8')
+        self.data = _cached(self.path, _load_yaml)
+
+    @classmethod
+    def load(cls, project_root) -> 'Pubspec':
+        return cls(Path(project_root) / 'pubspec.yaml')
+
+    @property
+    def name(self) -> Optional[str]:
+        return self.data.get('name')
+
+    @property
+    def version_string(self) -> Optional[str]:
+        value = self.data.get('version')
+        return str(value) if value is not None else None
+
+    @property
+    def version(self) -> Optional[str]:
+        return parse_version(self.version_string)[0] if self.version_string else None
+
+    @property
+    def build_number(self) -> Optional[str]:
+        return parse_version(self.version_string)[1] if self.version_string else None
+
+    def set_version(self, version: str, build_number=None):
+        """Update version (and build number) in memory; call save() to write"""
+        new_value = f"{version}+{build_number}" if build_number is not None else str(version)
+        if not VERSION_PATTERN.match(new_value):
+            raise ValueError(f"Invalid version: {new_value} (expected e.g. 1.2.3+4)")
+
+        if not VERSION_LINE.search(self.text):
+            raise ValueError(f"No top-level version: line in {self.path}")
+
+        self.text = VERSION_LINE.sub(
+            lambda m: f"{m.group(1)}{m.group(2)}{new_value}{m.group(2)}{m.group(4)}",
+            self.text,
+            count=1
+        )
+        self.data = dict(self.data, version=new_value)
+        return new_value
+
+    def bump(self, part: str = 'build') -> str:
+        """Increment one part of the version; lower parts reset, build always increments"""
+        if part not in BUMP_PARTS:
+            raise ValueError(f"Unknown version part: {part} (use {', '.join(BUMP_PARTS)})")
+
+        match = VERSION_PATTERN.match(self.version_string or '')
+        if not match:
+            raise ValueError(f"Cannot bump unparseable version: {self.version_string}")
+
+        major, minor, patch = (int(match.group(i)) for i in (1, 2, 3))
+        build = int(match.group(4) or 0)
+
+        if part == 'major':
+            major, minor, patch = major + 1, 0, 0
+        elif part == 'minor':
+            minor, patch = minor + 1, 0
+        elif part == 'patch':
+            patch += 1
+
+        return self.set_version(f"{major}.{minor}.{patch}", build + 1)
+
+    def save(self):
+        """Write pubspec.yaml back atomically"""
+        tmp_path = self.path.with_name(f".{self.path.name}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(self.text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+
+def locked_packages(project_root) -> Dict[str, str]:
+    """Return {package: version} from pubspec.lock"""
+    lock_path = Path(project_root) / 'pubspec.lock'
+    if not lock_path.exists():
+        return {}
+    return _cached(lock_path, _load_lock_packages)
+
+
+def main():
+    project_root = Path(__file__).parent
+    args = sys.argv[1:] or ['version']
+    if args[0] in ('-h', '--help'):
+        print(__doc__)
+        return
+    pubspec = Pubspec.load(project_root)
+
+    try:
+        if args[0] == 'version':
+            print(pubspec.version_string)
+        elif args[0] == 'bump':
+            print(pubspec.bump(args[1] if len(args) > 1 else 'build'))
+            pubspec.save()
+        elif args[0] == 'set' and len(args) > 1:
+            version, build = parse_version(args[1])
+            print(pubspec.set_version(version, build))
+            pubspec.save()
+        else:
+            print(__doc__)
+            sys.exit(2)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
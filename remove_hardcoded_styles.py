@@ -2,14 +2,31 @@
 """
 Automated script to replace ALL hardcoded TextStyle() instances with AppTextStyles
 from the global UI framework in typography.dart
+
+Usage: python3 remove_hardcoded_styles.py [--root DIR ...] [--include GLOB ...]
+         [--exclude GLOB ...] [--workers N] [--no-cache] [--cache-size MB]
+
+Computed edits are kept in the fix-plan cache (.fix_cache/, see
+fix_cache.py), so reruns over unchanged files do not redo the migration.
 """
 
 import re
 import os
+import hashlib
+import argparse
 from pathlib import Path
 
-# Base directory
-BASE_DIR = Path(__file__).parent / "lib"
+import fix_cache
+from source_scan import DEFAULT_EXCLUDES, DEFAULT_PATTERNS, discover, run_pool
+
+# Project and library directories
+PROJECT_ROOT = Path(__file__).parent
+BASE_DIR = PROJECT_ROOT / "lib"
+TYPOGRAPHY_FILE = BASE_DIR / "constants" / "typography.dart"
+
+# Test helpers inside lib/ (main_test.dart, ai_test_service.dart) are left
+# alone on a default run; explicit --root dirs (test/) are migrated in full
+DEFAULT_SKIP = ('*test*',) + DEFAULT_EXCLUDES
 
 # Style mapping based on fontSize and fontWeight
 STYLE_MAPPINGS = {
@@ -55,6 +72,13 @@ STYLE_MAPPINGS = {
     (11, None): 'AppTextStyles.captionSmall',
 }
 
+STYLE_PATTERN = re.compile(r'(style:\s*(?:const\s+)?TextStyle\([^)]*\))')
+IMPORT_PATTERN = re.compile(r"(import\s+['\"].*?['\"];)")
+
+# Bump when the rewrite logic changes; STYLE_MAPPINGS edits are picked up automatically
+MIGRATION_VERSION = 1
+TRANSFORM_VERSION = f"{MIGRATION_VERSION}:{hashlib.sha256(repr(STYLE_MAPPINGS).encode('utf-8')).hexdigest()[:16]}"
+
 def extract_font_size(textstyle_content):
     """Extract fontSize from TextStyle content"""
     match = re.search(r'fontSize:\s*(\d+(?:\.\d+)?)', textstyle_content)
@@ -151,74 +175,145 @@ def replace_textstyle(match):
     # Extract the style: part and replace it
     return re.sub(r'style:\s*(?:const\s+)?TextStyle\([^)]*\)', replacement, full_match)
 
-def process_file(filepath):
-    """Process a single Dart file"""
+def typography_import(filepath):
+    """Import path of typography.dart as seen from filepath"""
+    try:
+        # Inside lib/: relative import, as the rest of the codebase does
+        filepath.resolve().relative_to(BASE_DIR.resolve())
+        return os.path.relpath(TYPOGRAPHY_FILE, filepath.parent).replace(os.sep, '/')
+    except ValueError:
+        # test/, integration_test/ etc. can only reach lib/ through the package
+        from project_metadata import Pubspec  # yaml only when a root outside lib/ needs it
+        return f"package:{Pubspec.load(PROJECT_ROOT).name}/constants/typography.dart"
+
+def plan_edits(content, import_path):
+    """Edits that migrate one file, as (start, end, replacement) spans over content"""
+    edits = []
+
+    # Replace all TextStyle instances
+    # Pattern to match: style: TextStyle(...) or style: const TextStyle(...)
+    for match in STYLE_PATTERN.finditer(content):
+        replacement = replace_textstyle(match)
+        if replacement != match.group(0):
+            edits.append((match.start(), match.end(), replacement))
+
+    # Check if already has typography import
+    has_typography_import = "import '../../constants/typography.dart'" in content or \
+                            "import '../constants/typography.dart'" in content or \
+                            "import 'constants/typography.dart'" in content
+
+    # Add import after other imports if changes were made
+    if edits and not has_typography_import:
+        imports = list(IMPORT_PATTERN.finditer(content))
+        if imports:
+            end = imports[-1].end()
+            edits.append((end, end, f"\nimport '{import_path}';"))
+            edits.sort()
+
+    return edits
+
+def plan_key(filepath, content):
+    """Fix-plan cache key: file content plus everything else the migration depends on"""
+    return fix_cache.plan_key(content, f"{TRANSFORM_VERSION}\0{typography_import(filepath)}")
+
+def plan_file(filepath):
+    """Compute the edits for one file; None when it cannot be read"""
     try:
         with open(filepath, 'r', encoding='utf-8') as f:
             content = f.read()
+        return plan_edits(content, typography_import(filepath))
+    except Exception as e:
+        print(f"Error processing {filepath}: {e}")
+        return None
 
-        # Check if already has typography import
-        has_typography_import = "import '../../constants/typography.dart'" in content or \
-                                "import '../constants/typography.dart'" in content or \
-                                "import 'constants/typography.dart'" in content
-
-        original_content = content
-
-        # Replace all TextStyle instances
-        # Pattern to match: style: TextStyle(...) or style: const TextStyle(...)
-        pattern = r'(style:\s*(?:const\s+)?TextStyle\([^)]*\))'
-        content = re.sub(pattern, replace_textstyle, content)
-
-        # Add import if needed and changes were made
-        if content != original_content and not has_typography_import:
-            # Determine correct import path based on file location
-            rel_path = filepath.relative_to(BASE_DIR)
-            depth = len(rel_path.parts) - 1
-            import_path = '../' * depth + 'constants/typography.dart'
-
-            # Add import after other imports
-            import_pattern = r"(import\s+['\"].*?['\"];)"
-            imports = re.findall(import_pattern, content)
-            if imports:
-                last_import = imports[-1]
-                content = content.replace(
-                    last_import,
-                    f"{last_import}\nimport '{import_path}';"
-                )
-
-        # Write back if changed
-        if content != original_content:
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(content)
-            return True, filepath
+def write_plan(filepath, content, plan):
+    """Apply a plan to content and write it back; returns True when the file changed"""
+    if not plan:
+        return False
+    with open(filepath, 'w', encoding='utf-8') as f:
+        f.write(fix_cache.apply_plan(content, plan))
+    return True
 
+def process_file(filepath):
+    """Process a single Dart file without the cache: plan_file + write_plan"""
+    plan = plan_file(filepath)
+    if not plan:
         return False, None
-
-    except Exception as e:
+    try:
+        with open(filepath, 'r', encoding='utf-8') as f:
+            content = f.read()
+        write_plan(filepath, content, plan)
+        return True, filepath
+    except OSError as e:
         print(f"Error processing {filepath}: {e}")
         return False, None
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Replace hardcoded TextStyle() with AppTextStyles")
+    parser.add_argument('--root', action='append', dest='roots', metavar='DIR',
+                        help="Source root, relative to the project (repeatable, default: lib)")
+    parser.add_argument('--include', action='append', metavar='GLOB',
+                        help=f"File glob relative to each root (repeatable, default: {' '.join(DEFAULT_PATTERNS)})")
+    parser.add_argument('--exclude', action='append', metavar='GLOB',
+                        help=f"Glob of files to skip (repeatable, default: {' '.join(DEFAULT_SKIP)}; "
+                             f"{' '.join(DEFAULT_EXCLUDES)} with --root)")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Worker processes (default: 1 per 250 files, up to the CPU count)")
+    parser.add_argument('--no-cache', action='store_true', help="Recompute every file, ignoring the fix-plan cache")
+    parser.add_argument('--cache-size', type=float, default=fix_cache.DEFAULT_MAX_BYTES / (1024 * 1024),
+                        metavar='MB', help="Fix-plan cache bound, least recently used plans evicted first (default: %(default)g)")
+    return parser.parse_args()
+
 def main():
     """Main function to process all Dart files"""
-    print("🚀 Starting automated TextStyle replacement...")
-    print(f"📁 Base directory: {BASE_DIR}")
+    args = parse_args()
+    roots = [PROJECT_ROOT / root for root in (args.roots or ['lib'])]
 
-    # Find all .dart files
-    dart_files = list(BASE_DIR.rglob('*.dart'))
+    print("🚀 Starting automated TextStyle replacement...")
+    for root in roots:
+        print(f"📁 Root: {root}")
 
-    # Exclude test files
-    dart_files = [f for f in dart_files if 'test' not in str(f)]
+    # Find all .dart files across roots (symlinked duplicates counted once)
+    exclude = args.exclude or (DEFAULT_EXCLUDES if args.roots else DEFAULT_SKIP)
+    dart_files = discover(roots, args.include or DEFAULT_PATTERNS, exclude)
 
     print(f"📄 Found {len(dart_files)} Dart files to process\n")
 
-    modified_files = []
+    cache = None if args.no_cache else fix_cache.FixPlanCache(
+        PROJECT_ROOT, 'remove_hardcoded_styles', int(args.cache_size * 1024 * 1024))
 
+    # Files seen before (same content, same migration) reuse their plan
+    contents, keys, plans = {}, {}, {}
     for filepath in dart_files:
-        was_modified, modified_path = process_file(filepath)
-        if was_modified:
-            rel_path = modified_path.relative_to(BASE_DIR.parent)
-            print(f"✅ Modified: {rel_path}")
-            modified_files.append(modified_path)
+        try:
+            with open(filepath, 'r', encoding='utf-8') as f:
+                contents[filepath] = f.read()
+        except Exception as e:
+            print(f"Error processing {filepath}: {e}")
+            continue
+        if cache:
+            keys[filepath] = plan_key(filepath, contents[filepath])
+            plans[filepath] = cache.get(keys[filepath])
+
+    pending = [filepath for filepath in contents if plans.get(filepath) is None]
+    for filepath, plan in zip(pending, run_pool(plan_file, pending, args.workers)):
+        plans[filepath] = plan
+        if cache and plan is not None:
+            cache.put(keys[filepath], plan)
+
+    modified_files = []
+
+    for filepath in contents:
+        try:
+            if write_plan(filepath, contents[filepath], plans[filepath]):
+                print(f"✅ Modified: {filepath.relative_to(PROJECT_ROOT)}")
+                modified_files.append(filepath)
+        except Exception as e:
+            print(f"Error processing {filepath}: {e}")
+
+    if cache:
+        cache.save()
+        print(f"\n🗃️  Fix-plan cache: {cache.summary()}")
 
     print(f"\n🎉 Complete!")
     print(f"📝 Modified {len(modified_files)} files")
@@ -227,7 +322,7 @@ def main():
     if modified_files:
         print("\n📋 Modified files:")
         for filepath in modified_files:
-            print(f"   - {filepath.relative_to(BASE_DIR.parent)}")
+            print(f"   - {filepath.relative_to(PROJECT_ROOT)}")
 
 if __name__ == '__main__':
     main()
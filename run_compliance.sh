@@ -5,7 +5,7 @@ echo "🏜️ Odyseya Compliance Agent"
 echo "============================"
 echo ""
 
-python3 odyseya_compliance_agent.py "$@"
+python3 odyseya audit "$@"
 
 EXIT_CODE=$?
 
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Odyseya Source Scan
+Shared file discovery and worker pool for the source tools
+(odyseya_compliance_agent.py, remove_hardcoded_styles.py).
+
+Several roots and glob sets are expanded in one go, files reached twice
+(symlinks, overlapping roots) are kept once by real path, and all files
+from all roots go onto a single process pool largest-first, so a big
+file picked up last cannot leave one worker running alone at the end.
+
+Globs use fnmatch rules against the path relative to its root, so `*`
+also crosses directories: `*.dart` matches lib/a/b.dart.
+"""
+
+import os
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, List, Sequence
+
+DEFAULT_PATTERNS = ('*.dart',)
+DEFAULT_EXCLUDES = ('*.g.dart', '*.freezed.dart')
+
+
+# Below this many files per worker, starting processes (and rebuilding each
+# tool's tables in every one) costs more than the scan itself
+MIN_FILES_PER_WORKER = 250
+
+
+def default_workers(file_count: int = None) -> int:
+    """CPU count, scaled down so each worker gets at least MIN_FILES_PER_WORKER files"""
+    workers = os.cpu_count() or 1
+    if file_count is not None:
+        workers = min(workers, file_count // MIN_FILES_PER_WORKER)
+    return max(1, workers)
+
+
+def _walk(root: Path) -> Iterator[Path]:
+    """Yield files under root, following directory symlinks without looping"""
+    visited = set()
+    for dirpath, dirnames, filenames in os.walk(root, followlinks=True):
+        real = os.path.realpath(dirpath)
+        if real in visited:
+            dirnames[:] = []
+            continue
+        visited.add(real)
+        dirnames.sort()
+        for name in sorted(filenames):
+            yield Path(dirpath) / name
+
+
+def discover(roots: Iterable, patterns: Sequence[str] = DEFAULT_PATTERNS,
+             exclude: Sequence[str] = DEFAULT_EXCLUDES) -> List[Path]:
+    """Return the matching files of all roots, deduplicated, largest first"""
+    found = {}
+    for root in roots:
+        root = Path(root)
+        if root.is_file():
+            candidates = [(root, root.name)]
+        elif root.is_dir():
+            candidates = ((path, path.relative_to(root).as_posix()) for path in _walk(root))
+        else:
+            print(f"⚠️  Skipping missing root: {root}")
+            continue
+
+        for path, rel_path in candidates:
+            if not any(fnmatch(rel_path, pattern) for pattern in patterns):
+                continue
+            if any(fnmatch(rel_path, pattern) for pattern in exclude):
+                continue
+            try:
+                real = path.resolve()
+                size = path.stat().st_size
+            except OSError:
+                continue  # dangling symlink
+            if real not in found:
+                found[real] = (size, path)
+
+    # Largest first; path as tie-breaker keeps the order stable between runs
+    return [path for _, path in sorted(found.values(), key=lambda item: (-item[0], str(item[1])))]
+
+
+def run_pool(worker: Callable, files: Sequence[Path], workers: int = None,
+             initializer: Callable = None, initargs: tuple = ()) -> Iterator:
+    """Yield worker(path) for every file, in input order, from one shared pool"""
+    workers = workers or default_workers(len(files))
+    if workers == 1 or len(files) <= 1:
+        if initializer:
+            initializer(*initargs)
+        for path in files:
+            yield worker(path)
+        return
+
+    # Imported here: multiprocessing costs more startup than a small serial scan
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers, initializer=initializer, initargs=initargs) as pool:
+        # chunksize=1: tasks are handed out in the largest-first order
+        yield from pool.map(worker, files, chunksize=1)
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Tests for compliance_lsp.py: python3 test_compliance_lsp.py
+
+Random edits applied incrementally must give exactly the diagnostics of
+a fresh check of the edited text. The edits are seeded (0 by default, so
+every run checks the same ones); set ODYSEYA_LSP_SEED to fuzz further.
+"""
+
+import io
+import os
+import json
+import random
+import unittest
+from pathlib import Path
+
+from compliance_lsp import (ComplianceLanguageServer, Document, PARSE_ERROR, SERVER_NOT_INITIALIZED,
+                            utf16_length)
+from odyseya_compliance_agent import OdyseyaComplianceAgent
+
+PROJECT_ROOT = Path(__file__).parent
+
+SAMPLE_FILES = [
+    'lib/screens/auth/login_screen.dart',
+    'lib/screens/action/review_submit_screen.dart',
+    'lib/screens/paywall_screen.dart',
+]
+
+EDITS_PER_FILE = 120
+
+# Fragments that open/close brackets, regions and const expressions
+SNIPPETS = [
+    '', '\n', ')', '}', '],', 'const ', 'children: const [\n', 'const Row(\n',
+    'Container(\n  color: DesertColors.brownBramble,\n  child: ',
+    "style: TextStyle(color: Colors.white),\n", 'SizedBox(height: 8),\n',
+    'itemBuilder: (context, index) {\n', 'Widget build(BuildContext context) {\n',
+    'decoration: BoxDecoration(gradient: LinearGradient(colors: [])),\n',
+    "Image.asset('assets/images/Odyseya_word.png'),\n", '// comment\n', "'string with ( and {'",
+    # Rules that read lines below their own: button background, Image.asset cache size
+    'style: ElevatedButton.styleFrom(\n  foregroundColor: Colors.white,\n',
+    'backgroundColor: DesertColors.westernSunrise,\n', 'backgroundColor: Colors.white,\n',
+    "Image.asset(\n  'assets/images/Odyseya_word.png',\n", 'cacheWidth: 200,\n',
+]
+
+
+def position(lines, line, index):
+    return {'line': line, 'character': utf16_length(lines[line][:index]) if line < len(lines) else 0}
+
+
+def random_change(rng, lines):
+    """An incremental didChange content change over the current lines"""
+    if not lines or rng.random() < 0.02:
+        return {'text': ''.join(lines)}  # full sync now and then
+
+    first = rng.randrange(len(lines))
+    last = min(len(lines) - 1, first + rng.choice([0, 0, 0, 1, 2, 5, 40]))
+    start = rng.randrange(len(lines[first].rstrip('\n')) + 1)
+    end = rng.randrange(len(lines[last].rstrip('\n')) + 1)
+    if last == first and end < start:
+        start, end = end, start
+
+    source = rng.randrange(len(lines))
+    text = rng.choice(SNIPPETS + [''.join(lines[source:source + rng.randint(1, 6)])])
+    return {'range': {'start': position(lines, first, start), 'end': position(lines, last, end)}, 'text': text}
+
+
+class IncrementalCheckTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.agent = OdyseyaComplianceAgent(PROJECT_ROOT)
+
+    def test_random_edits_match_full_check(self):
+        seed = int(os.environ.get('ODYSEYA_LSP_SEED', 0))
+        rng = random.Random(seed)
+
+        for rel_path in SAMPLE_FILES:
+            uri = (PROJECT_ROOT / rel_path).as_uri()
+            document = Document(self.agent, uri, (PROJECT_ROOT / rel_path).read_text(encoding='utf-8'))
+            for step in range(EDITS_PER_FILE):
+                change = random_change(rng, document.lines)
+                document.apply_change(change)
+                fresh = Document(self.agent, uri, ''.join(document.lines))
+                self.assertEqual(document.diagnostics(), fresh.diagnostics(),
+                                 f"{rel_path}: edit {step} diverged (ODYSEYA_LSP_SEED={seed})")
+
+            # The incremental results also agree with the batch audit API
+            result = self.agent.audit_source(''.join(document.lines), PROJECT_ROOT / rel_path)
+            expected = sorted((v.line - 1, v.vtype) for v in result.violations)
+            actual = sorted((d['range']['start']['line'], d['code']) for d in document.diagnostics())
+            self.assertEqual(actual, expected, f"{rel_path} (ODYSEYA_LSP_SEED={seed})")
+
+
+def frame(message):
+    body = json.dumps(message).encode('utf-8')
+    return f"Content-Length: {len(body)}\r\n\r\n".encode('ascii') + body
+
+
+def read_responses(data):
+    messages = []
+    stream = io.BytesIO(data)
+    server = ComplianceLanguageServer(stream, io.BytesIO())
+    while True:
+        message = server.read_message()
+        if message is None:
+            return messages
+        messages.append(message)
+
+
+class ServerProtocolTest(unittest.TestCase):
+
+    def serve(self, *chunks):
+        stdout = io.BytesIO()
+        ComplianceLanguageServer(io.BytesIO(b''.join(chunks)), stdout).serve()
+        return read_responses(stdout.getvalue())
+
+    def test_requests_before_initialize(self):
+        uri = (PROJECT_ROOT / SAMPLE_FILES[0]).as_uri()
+        responses = self.serve(
+            frame({'jsonrpc': '2.0', 'method': 'textDocument/didOpen',
+                   'params': {'textDocument': {'uri': uri, 'languageId': 'dart', 'version': 1, 'text': ''}}}),
+            frame({'jsonrpc': '2.0', 'id': 1, 'method': 'shutdown'}),
+            frame({'jsonrpc': '2.0', 'method': 'exit'}),
+        )
+        self.assertEqual(responses, [{'jsonrpc': '2.0', 'id': 1,
+                                      'error': {'code': SERVER_NOT_INITIALIZED, 'message': "Server not initialized"}}])
+
+    def test_missing_content_length(self):
+        responses = self.serve(
+            b"Content-Type: application/vscode-jsonrpc\r\n\r\n",
+            frame({'jsonrpc': '2.0', 'id': 1, 'method': 'initialize', 'params': {'rootPath': str(PROJECT_ROOT)}}),
+        )
+        self.assertEqual(responses[0]['error']['code'], PARSE_ERROR)
+        self.assertEqual(responses[1]['id'], 1)
+        self.assertIn('capabilities', responses[1]['result'])
+
+
+if __name__ == '__main__':
+    unittest.main()
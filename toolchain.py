@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Odyseya Toolchain Backends
+Where the deployment agent's shell commands actually run.
+
+ShellBackend runs them for real. FakeToolchainBackend stands in for
+flutter, pod, xcodebuild and open on machines that do not have them
+(Linux CI): each tool gets a configurable latency, amount of output and
+failure mode, so the pipeline can be exercised and timed anywhere.
+Backends also say whether the agent may change the checkout (dry_run):
+with the fake toolchain nothing in the project is written.
+
+Fake config (JSON, all keys optional; example: fake_toolchain.json):
+
+    {
+      "seed": 1,
+      "latency_scale": 0.1,
+      "platform": "Darwin",
+      "tools": {
+        "flutter build ios": {"latency": 30, "output_lines": 4000, "fail_rate": 0.2},
+        "pod install": {"fail": true, "stderr": "CDN: trunk URL couldn't be downloaded"},
+        "xcodebuild": {"missing": true}
+      }
+    }
+
+Tool keys match the start of a command (after any `cd dir &&`); the
+longest match wins. `stderr` is what a failing call prints.
+
+Usage:
+  python3 toolchain.py bench [--config FILE] [--scale 0.05] [--targets ios appbundle web]
+  python3 appstore_deployment_agent.py --fake-toolchain [FILE] --yes
+"""
+
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import threading
+import subprocess
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+# Without a config, fake tools run 100x faster than the real ones (ios build: 3s)
+DEFAULT_LATENCY_SCALE = 0.01
+
+# Seconds at latency_scale 1.0, and the first line the real tool prints
+DEFAULT_TOOLS = {
+    'flutter --version': {'latency': 0.8, 'stdout': 'Flutter 3.24.3 • channel stable • https://github.com/flutter/flutter.git'},
+    'flutter clean': {'latency': 2.0, 'output_lines': 10},
+    'flutter pub get': {'latency': 6.0, 'output_lines': 120},
+    'flutter build ios': {'latency': 300.0, 'output_lines': 3000},
+    'flutter build appbundle': {'latency': 240.0, 'output_lines': 2000},
+    'flutter build web': {'latency': 90.0, 'output_lines': 400},
+    'pod install': {'latency': 40.0, 'output_lines': 300},
+    'xcodebuild -version': {'latency': 0.5, 'stdout': 'Xcode 16.0\nBuild version 16A242d'},
+    'xcodebuild': {'latency': 600.0, 'output_lines': 8000},
+    'open': {'latency': 0.1},
+}
+
+
+class ShellBackend:
+    """Runs commands with the system shell"""
+
+    dry_run = False
+
+    def __init__(self):
+        self.platform = platform.system()
+
+    def run(self, command: str, cwd, capture: bool = True, log_path=None) -> Tuple[bool, str, str]:
+        try:
+            if log_path:
+                with open(log_path, 'w') as log:
+                    result = subprocess.run(command, shell=True, stdout=log, stderr=subprocess.STDOUT, cwd=cwd)
+                return result.returncode == 0, "", ""
+            elif capture:
+                result = subprocess.run(command, shell=True, capture_output=True, text=True, cwd=cwd)
+                return result.returncode == 0, result.stdout, result.stderr
+            else:
+                result = subprocess.run(command, shell=True, cwd=cwd)
+                return result.returncode == 0, "", ""
+        except Exception as e:
+            return False, "", str(e)
+
+
+class FakeTool:
+    """Simulated behaviour of one tool invocation"""
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, output_lines: int = 0, stdout: str = '',
+                 stderr: str = '', fail: bool = False, fail_rate: float = 0.0, missing: bool = False):
+        self.latency = latency
+        self.jitter = jitter  # +/- fraction of latency
+        self.output_lines = output_lines
+        self.stdout = stdout
+        self.stderr = stderr
+        self.fail = fail
+        self.fail_rate = fail_rate
+        self.missing = missing  # behaves as "command not found"
+
+
+class FakeToolchainBackend:
+    """Stand-in for flutter/pod/xcodebuild/open with configurable latency, output and failures"""
+
+    dry_run = True  # simulated runs must leave the checkout untouched
+
+    def __init__(self, config: Dict = None):
+        config = config or {}
+        tools = dict(DEFAULT_TOOLS)
+        for name, spec in config.get('tools', {}).items():
+            tools[name] = dict(tools.get(name, {}), **spec)
+
+        self.tools = {name: FakeTool(**spec) for name, spec in tools.items()}
+        self.default = FakeTool(**config.get('default', {}))
+        self.latency_scale = config.get('latency_scale', DEFAULT_LATENCY_SCALE)
+        self.platform = config.get('platform', 'Darwin')
+        self.random = random.Random(config.get('seed'))
+        self.calls: List[Tuple[str, float, bool]] = []  # (command, seconds, success)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_file(cls, path) -> 'FakeToolchainBackend':
+        with open(path, 'r') as f:
+            return cls(json.load(f))
+
+    def match(self, command: str) -> Tuple[str, FakeTool]:
+        """Tool spec for a command: longest key that prefixes it, ignoring a leading `cd dir &&`"""
+        command = command.split('&&')[-1].strip()
+        best = max((name for name in self.tools if command == name or command.startswith(name + ' ')),
+                   key=len, default=None)
+        return (best, self.tools[best]) if best else (command.split(' ')[0], self.default)
+
+    def run(self, command: str, cwd=None, capture: bool = True, log_path=None) -> Tuple[bool, str, str]:
+        name, tool = self.match(command)
+        with self._lock:
+            jitter = self.random.uniform(-tool.jitter, tool.jitter) if tool.jitter else 0.0
+            failed = tool.fail or (tool.fail_rate and self.random.random() < tool.fail_rate)
+
+        start = time.monotonic()
+        time.sleep(max(0.0, tool.latency * (1 + jitter) * self.latency_scale))
+
+        if tool.missing:
+            success, stdout, stderr = False, '', f"/bin/sh: {name.split(' ')[0]}: command not found\n"
+        else:
+            lines = [tool.stdout] if tool.stdout else []
+            lines += [f"[fake {name}] step {i + 1}/{tool.output_lines}" for i in range(tool.output_lines)]
+            stdout = '\n'.join(lines) + ('\n' if lines else '')
+            stderr = (tool.stderr or f"[fake {name}] simulated failure\n") if failed else ''
+            success = not failed
+
+        if log_path:
+            with open(log_path, 'w') as log:
+                log.write(stdout + stderr)
+            stdout = stderr = ''
+        elif not capture:
+            sys.stdout.write(stdout)
+            sys.stderr.write(stderr)
+            stdout = stderr = ''
+
+        with self._lock:
+            self.calls.append((command, time.monotonic() - start, success))
+        return success, stdout, stderr
+
+
+def bench_builds(config: Dict, targets, parallelism):
+    """Time the build DAG on the fake toolchain at several concurrency limits"""
+    import tempfile
+    from build_scheduler import BuildScheduler, default_tasks
+
+    project_root = Path(__file__).parent
+    log_dir = tempfile.mkdtemp(prefix='odyseya-bench-')  # keep build/ of the checkout untouched
+    print(f"🧪 Fake build DAG: {', '.join(targets)} "
+          f"(latency scale {config.get('latency_scale', DEFAULT_LATENCY_SCALE)})\n")
+    for max_parallel in parallelism:
+        backend = FakeToolchainBackend(config)
+        scheduler = BuildScheduler(
+            project_root, default_tasks(targets), max_parallel=max_parallel, memory_budget_mb=1 << 20,
+            runner=lambda command, log_path: backend.run(command, project_root, log_path=log_path)[0],
+            host_platform=backend.platform, log_dir=log_dir
+        )
+        start = time.monotonic()
+        success = scheduler.run()
+        wall = time.monotonic() - start
+        serial = sum(seconds for _, seconds, _ in backend.calls)
+        print(f"   max_parallel={max_parallel}: {wall:.2f}s wall, {serial:.2f}s of tool time, "
+              f"{'ok' if success else 'failed'}\n")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Fake toolchain for the deployment pipeline")
+    commands = parser.add_subparsers(dest='command', required=True)
+    bench = commands.add_parser('bench', help="Time the build DAG on the fake toolchain")
+    bench.add_argument('--config', type=Path, help="Fake toolchain JSON config")
+    bench.add_argument('--scale', type=float, default=None,
+                       help=f"Latency scale (default: config or {DEFAULT_LATENCY_SCALE})")
+    bench.add_argument('--targets', nargs='+', default=['ios', 'appbundle', 'web'])
+    bench.add_argument('--parallel', type=int, nargs='+', default=[1, 2, 3], help="max_parallel values to compare")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    config = {}
+    if args.config:
+        with open(args.config, 'r') as f:
+            config = json.load(f)
+    if args.scale is not None:
+        config['latency_scale'] = args.scale
+
+    if args.command == 'bench':
+        bench_builds(config, args.targets, args.parallel)
+
+
+if __name__ == '__main__':
+    main()